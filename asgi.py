@@ -0,0 +1,24 @@
+"""ASGI entry point: the Solara app plus a Prometheus /metrics endpoint.
+
+Run with::
+
+    SOLARA_APP=./pages uvicorn asgi:app --host 0.0.0.0 --port 8765
+"""
+
+import solara.server.starlette
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from easement_app import metrics, tileproxy
+
+routes = [
+    Route("/metrics", endpoint=metrics.endpoint),
+    Route("/tiles/{layer}/{z:int}/{x:int}/{y:int}", endpoint=tileproxy.endpoint),
+    *solara.server.starlette.routes,
+]
+
+app = Starlette(
+    routes=routes,
+    lifespan=solara.server.starlette.lifespan,
+    middleware=solara.server.starlette.middleware,
+)
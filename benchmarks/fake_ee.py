@@ -0,0 +1,412 @@
+"""A local stand-in for the earthengine-api package.
+
+Every ee object is a lazy expression that accepts any method call, like the
+real client library. Evaluating one (getInfo, getMapId, thumbnails,
+downloads, computeFeatures) goes through ``ee.data`` and is recorded as one
+server round trip by ``recorder``, after sleeping for ``recorder.latency``
+seconds. The returned values are plausible placeholders, shaped like the
+responses geemap and the pages expect.
+
+install() must run before geemap or the app modules import ``ee``.
+"""
+
+import json
+import sys
+import threading
+import time
+import types
+
+# Number of images, months or bands reported for any collection.
+FRAMES = 10
+
+EASEMENT_PROPERTIES = {
+    "OBJECTID": 1,
+    "NEST_AGREE": "NE-0001",
+    "NEST_RESTO": "RESTORED",
+    "ClosingDat": "2005-06-01",
+    "NEST_Acres": 120.5,
+}
+
+
+class Recorder:
+    """Counts the server round trips and injects latency into each of them."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, kind):
+        with self._lock:
+            self.calls.append(kind)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+
+    def count(self):
+        with self._lock:
+            return len(self.calls)
+
+
+recorder = Recorder()
+
+
+class EEException(Exception):
+    pass
+
+
+class _Meta(type):
+    def __getattr__(cls, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def static(*args, **kwargs):
+            return _return_type(name, cls)._call(
+                f"{cls.__name__}.{name}", None, args, kwargs
+            )
+
+        return static
+
+
+class ComputedObject(metaclass=_Meta):
+    def __init__(self, *args, **kwargs):
+        self._func = type(self).__name__
+        self._source = None
+        self._args = _trace(type(self), args)
+        self._kwargs = _trace(type(self), kwargs)
+
+    @classmethod
+    def _call(cls, func, source, args, kwargs):
+        obj = cls.__new__(cls)
+        obj._func = func
+        obj._source = source
+        obj._args = _trace(type(source) if source is not None else cls, args)
+        obj._kwargs = _trace(type(source) if source is not None else cls, kwargs)
+        return obj
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return _return_type(name, type(self))._call(name, self, args, kwargs)
+
+        return method
+
+    def serialize(self, for_cloud_api=True):
+        return json.dumps(_encode(self), sort_keys=True, default=str)
+
+    def getInfo(self):
+        return data.computeValue(self)
+
+    def evaluate(self, callback):
+        callback(self.getInfo(), None)
+
+    def getMapId(self, vis_params=None):
+        return data.getMapId({"image": self, **(vis_params or {})})
+
+    def getThumbURL(self, params=None):
+        return data.getThumbId({"image": self, **(params or {})})["url"]
+
+    def getThumbUrl(self, params=None):
+        return self.getThumbURL(params)
+
+    def getVideoThumbURL(self, params=None):
+        return data.getVideoThumbId({"collection": self, **(params or {})})["url"]
+
+    def getDownloadURL(self, params=None, *args, **kwargs):
+        return data.getDownloadId({"image": self, **(params or {})})["url"]
+
+    def __repr__(self):
+        return f"ee.{type(self).__name__}({self._func})"
+
+
+class Element(ComputedObject):
+    pass
+
+
+class Collection(Element):
+    pass
+
+
+class Image(Element):
+    pass
+
+
+class Feature(Element):
+    pass
+
+
+class ImageCollection(Collection):
+    pass
+
+
+class FeatureCollection(Collection):
+    pass
+
+
+class Geometry(ComputedObject):
+    def __init__(self, geo_json=None, *args, **kwargs):
+        super().__init__(geo_json, *args, **kwargs)
+        self._geo_json = geo_json if isinstance(geo_json, dict) else None
+
+    def toGeoJSON(self):
+        if self._geo_json is None:
+            raise EEException("Can't convert a computed geometry to GeoJSON.")
+        return self._geo_json
+
+
+for _name in [
+    "Array",
+    "Date",
+    "DateRange",
+    "Dictionary",
+    "ErrorMargin",
+    "Filter",
+    "Join",
+    "Kernel",
+    "List",
+    "Number",
+    "Projection",
+    "Reducer",
+    "String",
+    "Algorithms",
+    "Classifier",
+    "Clusterer",
+    "Terrain",
+    "PixelType",
+]:
+    globals()[_name] = type(_name, (ComputedObject,), {})
+
+# Return types of the methods that change the kind of object.
+_RETURN_TYPES = {
+    "median": Image,
+    "mean": Image,
+    "mosaic": Image,
+    "first": Image,
+    "qualityMosaic": Image,
+    "pixelArea": Image,
+    "normalizedDifference": Image,
+    "geometry": Geometry,
+    "bounds": Geometry,
+    "centroid": Geometry,
+    "Point": Geometry,
+    "Polygon": Geometry,
+    "Rectangle": Geometry,
+    "MultiPolygon": Geometry,
+    "size": Number,
+    "area": Number,
+    "reduceRegion": Dictionary,
+    "toDictionary": Dictionary,
+    "toList": List,
+    "aggregate_array": List,
+    "bandNames": List,
+    "keys": List,
+    "reduceRegions": FeatureCollection,
+}
+
+
+def _return_type(name, default):
+    return _RETURN_TYPES.get(name, default)
+
+
+def _element_type(cls):
+    if issubclass(cls, ImageCollection):
+        return Image
+    if issubclass(cls, FeatureCollection):
+        return Feature
+    return ComputedObject
+
+
+def _trace(cls, value):
+    """Replaces callables (e.g. the function of .map()) by the expression they
+    build, like the client library does."""
+    if isinstance(value, dict):
+        return {k: _trace(cls, v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_trace(cls, v) for v in value)
+    if callable(value) and not isinstance(value, (ComputedObject, type)):
+        element = _element_type(cls)._call("_element", None, (), {})
+        try:
+            return _Traced(value(element))
+        except Exception:
+            return _Traced(None)
+    return value
+
+
+class _Traced:
+    def __init__(self, result):
+        self.result = result
+
+
+def _encode(value):
+    if isinstance(value, ComputedObject):
+        return [
+            value._func,
+            _encode(value._source),
+            _encode(value._args),
+            _encode(value._kwargs),
+        ]
+    if isinstance(value, _Traced):
+        return ["function", _encode(value.result)]
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _first_arg(obj):
+    args = list(obj._args) + list(obj._kwargs.values())
+    return args[0] if args else None
+
+
+def _dates():
+    return [f"{2014 + i}-01-01" for i in range(FRAMES)]
+
+
+def resolve(obj):
+    """Returns a placeholder value for an evaluated expression."""
+    if not isinstance(obj, ComputedObject):
+        if isinstance(obj, dict):
+            return {k: resolve(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [resolve(v) for v in obj]
+        if isinstance(obj, _Traced):
+            return resolve(obj.result)
+        return obj
+
+    func = obj._func
+    arg = _first_arg(obj)
+    if func == "Dictionary":
+        if isinstance(arg, dict):
+            return resolve(arg)
+        if isinstance(arg, ComputedObject) and arg._func == "get":
+            # A frequency histogram, as computed by geemap.image_value_list.
+            return {str(i): 10 * (i + 1) for i in range(0, 101, 5)}
+        return {}
+    if func in ("size", "length"):
+        return FRAMES
+    if func == "aggregate_array":
+        if arg == "area":
+            return [{"water": float(i)} for i in range(FRAMES)]
+        if arg == "system:index":
+            return [f"{2014 + i // 12}_{i % 12 + 1:02d}" for i in range(FRAMES)]
+        return _dates()
+    if func == "map" and obj._args and isinstance(obj._args[0], _Traced):
+        return [resolve(obj._args[0])] * FRAMES
+    if func in ("toDictionary", "getInfo"):
+        return dict(EASEMENT_PROPERTIES)
+    if func in ("toList", "bandNames", "keys", "dates"):
+        return _dates()
+    if func == "format":
+        return _dates()[0]
+    if func in ("reduceRegion", "reduceRegions"):
+        return {"new_water_ha": 1.0, "disappeared_water_ha": 2.0}
+    if func in ("area", "Number"):
+        return 1.0
+    if isinstance(obj, (List, ImageCollection)):
+        return _dates()
+    if obj._source is not None:
+        return resolve(obj._source)
+    return None
+
+
+class _TileFetcher:
+    def __init__(self, url_format):
+        self.url_format = url_format
+
+
+def _computeValue(obj):
+    recorder.record("computeValue")
+    return resolve(obj)
+
+
+def _getMapId(params):
+    recorder.record("getMapId")
+    key = abs(hash(json.dumps(_encode(params), sort_keys=True, default=str)))
+    url = f"https://fake-ee.test/map/{key:x}/{{z}}/{{x}}/{{y}}"
+    return {"mapid": f"{key:x}", "token": "", "tile_fetcher": _TileFetcher(url)}
+
+
+def _getThumbId(params, thumbType=None):
+    recorder.record("getThumbId")
+    return {"thumbid": "thumb", "token": "", "url": "https://fake-ee.test/thumb"}
+
+
+def _getVideoThumbId(params):
+    recorder.record("getVideoThumbId")
+    return {"thumbid": "video", "token": "", "url": "https://fake-ee.test/video"}
+
+
+def _getDownloadId(params):
+    recorder.record("getDownloadId")
+    return {"docid": "download", "token": "", "url": "https://fake-ee.test/download"}
+
+
+def _computeFeatures(params):
+    recorder.record("computeFeatures")
+    import pandas as pd
+
+    return pd.DataFrame(
+        [{"OBJECTID": 1, "new_water_ha": 1.0, "disappeared_water_ha": 2.0}]
+    )
+
+
+class _State:
+    credentials = "fake"
+
+
+def _make_data():
+    module = types.ModuleType("ee.data")
+    module.computeValue = _computeValue
+    module.getMapId = _getMapId
+    module.getThumbId = _getThumbId
+    module.getVideoThumbId = _getVideoThumbId
+    module.getFilmstripThumbId = _getThumbId
+    module.getDownloadId = _getDownloadId
+    module.getTableDownloadId = _getDownloadId
+    module.computeFeatures = _computeFeatures
+    module.setUserAgent = lambda *args, **kwargs: None
+    module._get_state = lambda: _State()
+    module._credentials = "fake"
+    return module
+
+
+data = _make_data()
+
+
+def Initialize(*args, **kwargs):
+    pass
+
+
+def Authenticate(*args, **kwargs):
+    return True
+
+
+def Reset():
+    pass
+
+
+def install(latency=0.0):
+    """Registers this module as ``ee`` and returns the recorder."""
+    recorder.latency = latency
+    module = sys.modules[__name__]
+    module.data = data
+    module.EEException = EEException
+    module.__version__ = "0.0.0-fake"
+    sys.modules["ee"] = module
+    sys.modules["ee.data"] = data
+    sys.modules["ee.ee_exception"] = module
+    return recorder
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    cls = type(name, (ComputedObject,), {})
+    globals()[name] = cls
+    return cls
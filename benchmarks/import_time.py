@@ -0,0 +1,71 @@
+"""Server startup import time of the pages, measured in fresh interpreters.
+
+Solara imports every module under pages/ when the app starts. This compares
+the routes as they are loaded now (thin pages, Map classes imported on first
+visit) with the eager variant that also imports every Map module, which is
+what the pages used to do at module level::
+
+    python benchmarks/import_time.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VIEWS = ["timelapse", "timeseries", "jrc", "compare", "naip"]
+
+SCENARIOS = {
+    "startup (lazy pages)": "",
+    "startup (eager, all Map modules)": "; ".join(
+        f"import easement_app.views.{view}" for view in VIEWS
+    ),
+}
+
+SCRIPT = """
+import time
+from pathlib import Path
+t = time.perf_counter()
+from solara.autorouting import generate_routes_directory
+generate_routes_directory(Path({pages!r}))
+{extra}
+print(time.perf_counter() - t)
+"""
+
+
+def measure(extra, runs):
+    times = []
+    # The warm-up thread needs Earth Engine credentials. It imports no page
+    # module, so turning it off leaves the route loading measured unchanged.
+    env = dict(os.environ, PYTHONPATH=ROOT, EASEMENT_APP_WARMUP="0")
+    for _ in range(runs):
+        script = SCRIPT.format(pages=os.path.join(ROOT, "pages"), extra=extra)
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {name: measure(extra, args.runs) for name, extra in SCENARIOS.items()}
+    for name, seconds in results.items():
+        print(f"{name:<36} {seconds:8.3f} s")
+    lazy, eager = results.values()
+    print(f"{'saved at startup':<36} {eager - lazy:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Round trips and wall time of every page action, against a fake Earth Engine.
+
+Each action runs headlessly on a freshly built page map, with the process-wide
+caches cleared, so the numbers are those of a cold request. Earth Engine is
+replaced by benchmarks/fake_ee.py, which counts the server calls and sleeps
+--latency seconds in each::
+
+    python benchmarks/round_trips.py                 # report
+    python benchmarks/round_trips.py --check         # fail on regressions
+    python benchmarks/round_trips.py --update        # store a new baseline
+
+--check exits with status 1 when an action needs more round trips than the
+baseline, or takes longer than the baseline by more than --tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+# A click inside the fake easement, as (lat, lon).
+CLICK = [40.5, -100.5]
+EASEMENT_BOUNDS = (-101.0, 40.0, -100.0, 41.0)
+
+
+def setup_environment(latency):
+    """Installs the fake ee module and a local easement index."""
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, HERE)
+    cache = tempfile.mkdtemp(prefix="easement-app-bench-")
+    os.environ["EASEMENT_APP_CACHE"] = cache
+    os.environ["EASEMENT_APP_WARMUP"] = "0"
+
+    import fake_ee
+
+    recorder = fake_ee.install(latency)
+
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    from easement_app import easements
+
+    properties = {k: [v] for k, v in fake_ee.EASEMENT_PROPERTIES.items()}
+    gdf = gpd.GeoDataFrame(
+        properties, geometry=[box(*EASEMENT_BOUNDS)], crs="EPSG:4326"
+    )
+    os.makedirs(os.path.dirname(easements.INDEX_PATH), exist_ok=True)
+    gdf.to_parquet(easements.INDEX_PATH)
+    return recorder
+
+
+def clear_caches():
+    from easement_app import jrc, tiles, timeseries
+
+    tiles.clear()
+    timeseries._cache.clear()
+    jrc._histories.clear()
+
+
+def find_button(widget, description):
+    if getattr(widget, "description", None) == description and hasattr(widget, "click"):
+        return widget
+    for child in getattr(widget, "children", ()):
+        found = find_button(child, description)
+        if found is not None:
+            return found
+    return None
+
+
+def click_button(m, description):
+    for control in m.controls:
+        button = find_button(getattr(control, "widget", None), description)
+        if button is not None:
+            button.click()
+            return
+    raise LookupError(f"No {description!r} button")
+
+
+def click_map(m):
+    m._interaction_callbacks(type="click", coordinates=CLICK)
+
+
+class _TaskErrors(logging.Handler):
+    """Collects the exceptions that TaskGroup logs instead of raising."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.errors = []
+
+    def emit(self, record):
+        if record.exc_info:
+            self.errors.append(record.exc_info[1])
+
+
+task_errors = _TaskErrors()
+
+
+def wait(m, timeout=120):
+    """Waits until the map's tasks, including ones they submitted, are done."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        futures = list(m.tasks._futures.values())
+        if all(f.done() for f in futures):
+            for f in futures:
+                f.result()
+            if futures == list(m.tasks._futures.values()):
+                return
+        time.sleep(0.005)
+    raise TimeoutError("Tasks did not finish")
+
+
+def build_map(view):
+    import importlib
+
+    module = importlib.import_module(f"easement_app.views.{view}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return module.Map(center=[40, -100], zoom=4)
+
+
+def search(m, query="NE-0001"):
+    for control in m.controls:
+        for widget in getattr(getattr(control, "widget", None), "children", ()):
+            if getattr(widget, "placeholder", None) == "OBJECTID or NEST_AGREE":
+                # What the browser syncs when Enter is pressed.
+                widget.value = query
+                return
+    raise LookupError("No search box")
+
+
+def without_index():
+    from easement_app import easements
+
+    easements.get_index = lambda *args, **kwargs: None
+
+
+# name: (page view, needs a selected easement, action)
+ACTIONS = {
+    "click (local index)": ("jrc", False, click_map),
+    "click (Earth Engine)": ("jrc", False, click_map),
+    "search (local index)": ("jrc", False, search),
+    "timeseries: Time slider": (
+        "timeseries",
+        True,
+        lambda m: click_button(m, "Time slider"),
+    ),
+    "timeseries: Split map": (
+        "timeseries",
+        True,
+        lambda m: click_button(m, "Split map"),
+    ),
+    "jrc: Occurrence": ("jrc", True, lambda m: click_button(m, "Occurrence")),
+    "jrc: Monthly history": (
+        "jrc",
+        True,
+        lambda m: click_button(m, "Monthly history"),
+    ),
+    "compare: Apply": ("compare", True, lambda m: click_button(m, "Apply")),
+    "naip: Time slider": ("naip", True, lambda m: click_button(m, "Time slider")),
+    "naip: Split map": ("naip", True, lambda m: click_button(m, "Split map")),
+}
+
+
+def run_action(name, recorder):
+    view, select, action = ACTIONS[name]
+    from easement_app import easements
+
+    get_index = easements.get_index
+    if name == "click (Earth Engine)":
+        without_index()
+    try:
+        m = build_map(view)
+        if select:
+            click_map(m)
+            wait(m)
+        clear_caches()
+        recorder.reset()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            action(m)
+            wait(m)
+        seconds = time.perf_counter() - start
+        if task_errors.errors:
+            raise task_errors.errors[0]
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    finally:
+        easements.get_index = get_index
+        task_errors.errors = []
+    return {"round_trips": recorder.count(), "seconds": round(seconds, 3)}
+
+
+def check(results, baseline, tolerance):
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if "error" in result:
+            # An action that already failed in the baseline is not a regression.
+            if expected is None or expected.get("error") != result["error"]:
+                failures.append(f"{name}: {result['error']}")
+            continue
+        if expected is None or "error" in expected:
+            continue
+        if result["round_trips"] > expected["round_trips"]:
+            failures.append(
+                f"{name}: {result['round_trips']} round trips "
+                f"(baseline {expected['round_trips']})"
+            )
+        if result["seconds"] > expected["seconds"] * (1 + tolerance) + 0.05:
+            failures.append(
+                f"{name}: {result['seconds']:.3f} s (baseline {expected['seconds']:.3f} s)"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds per round trip."
+    )
+    parser.add_argument("--only", nargs="*", help="Run only these actions.")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    recorder = setup_environment(args.latency)
+    logging.getLogger("easement_app.tasks").addHandler(task_errors)
+
+    results = {}
+    for name in args.only or ACTIONS:
+        result = results[name] = run_action(name, recorder)
+        if "error" in result:
+            print(f"{name:<28} failed: {result['error']}")
+        else:
+            print(
+                f"{name:<28} {result['round_trips']:4d} round trips "
+                f"{result['seconds']:8.3f} s"
+            )
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump({"latency": args.latency, "actions": results}, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("latency") != args.latency:
+            raise SystemExit(
+                f"The baseline was measured with --latency {baseline.get('latency')}"
+            )
+        failures = check(results, baseline["actions"], args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            raise SystemExit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Shared helpers for the easement Solara pages."""
+
+import os
+
+EASEMENT_ASSET = "projects/ee-giswqs/assets/easements"
+
+CACHE_DIR = os.environ.get(
+    "EASEMENT_APP_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "easement-app"),
+)
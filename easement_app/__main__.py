@@ -0,0 +1,198 @@
+"""Command line entry point: ``python -m easement_app <command>``."""
+
+import argparse
+from datetime import date
+
+
+def refresh_index(args):
+    import geemap
+
+    from . import easements
+
+    geemap.ee_initialize()
+    count = easements.refresh_index(args.path)
+    print(f"Wrote {count} easements to {args.path}")
+
+
+def precompute_composites(args):
+    import geemap
+
+    from . import composites, easements
+
+    index = easements.get_index()
+    if index is None:
+        raise SystemExit("No easement snapshot found, run refresh-index first.")
+
+    geemap.ee_initialize()
+    results = composites.precompute(
+        index,
+        args.start_year,
+        args.end_year,
+        objectids=args.objectid,
+        window=(args.start_date, args.end_date),
+        store=args.store,
+        scale=args.scale,
+        workers=args.workers,
+    )
+    for objectid, result in results:
+        if isinstance(result, Exception):
+            print(f"{objectid}: failed: {result}")
+        else:
+            print(f"{objectid}: {result} new composites")
+
+
+def jrc_histograms(args):
+    from . import easements, jrc
+
+    index = easements.get_index()
+    if index is None:
+        raise SystemExit("No easement snapshot found, run refresh-index first.")
+
+    failed = 0
+    for objectid, error in jrc.build_histogram_table(
+        index, args.path, scale=args.scale, workers=args.workers
+    ):
+        if error is not None:
+            failed += 1
+            print(f"{objectid}: failed: {error}")
+    if failed == len(index):
+        raise SystemExit(f"All easements failed, {args.path} was not written.")
+    print(f"Wrote {args.path} ({failed} failed)")
+
+
+def summarize_compare(args):
+    import geemap
+
+    from . import compare
+
+    geemap.ee_initialize()
+    stats = compare.summarize(
+        [date.fromisoformat(d) for d in args.pre],
+        [date.fromisoformat(d) for d in args.post],
+        pre_cloud_cover=args.pre_cloud_cover,
+        post_cloud_cover=args.post_cloud_cover,
+        threshold=args.threshold,
+        scale=args.scale,
+    )
+    df = compare.write_summary(stats, args.path)
+    print(
+        f"Wrote {len(df)} easements to {args.path}: "
+        f"{df['new_water_ha'].sum():.1f} ha new water, "
+        f"{df['disappeared_water_ha'].sum():.1f} ha disappeared water"
+    )
+
+
+def compare_batch(args):
+    import geemap
+
+    from . import easements, runner
+
+    index = easements.get_index()
+    if index is None:
+        raise SystemExit("No easement snapshot found, run refresh-index first.")
+
+    geemap.ee_initialize()
+    jobs = runner.read_jobs(args.jobs)
+    failed = 0
+    for key, result in runner.run(
+        jobs,
+        index,
+        args.results,
+        workers=args.workers,
+        scale=args.scale,
+        retries=args.retries,
+    ):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"{key}: failed: {result}")
+    print(f"Wrote {args.results} ({failed} failed, rerun to retry)")
+
+
+def main(argv=None):
+    from . import compare, composites, easements, jrc, runner
+
+    parser = argparse.ArgumentParser(prog="python -m easement_app")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_index = subparsers.add_parser(
+        "refresh-index", help="Re-sync the local easement snapshot from Earth Engine."
+    )
+    parser_index.add_argument("--path", default=easements.INDEX_PATH)
+    parser_index.set_defaults(func=refresh_index)
+
+    parser_composites = subparsers.add_parser(
+        "precompute-composites",
+        help="Download annual Landsat composites of every easement as COGs.",
+    )
+    parser_composites.add_argument("--start-year", type=int, default=1984)
+    parser_composites.add_argument(
+        "--end-year", type=int, default=date.today().year - 1
+    )
+    parser_composites.add_argument(
+        "--start-date", default=composites.DEFAULT_WINDOW[0], help="MM-DD"
+    )
+    parser_composites.add_argument(
+        "--end-date", default=composites.DEFAULT_WINDOW[1], help="MM-DD"
+    )
+    parser_composites.add_argument(
+        "--objectid", nargs="*", help="Only these easements (default: all)."
+    )
+    parser_composites.add_argument("--scale", type=int, default=30)
+    parser_composites.add_argument("--workers", type=int, default=4)
+    parser_composites.add_argument("--store", default=composites.STORE_DIR)
+    parser_composites.set_defaults(func=precompute_composites)
+
+    parser_jrc = subparsers.add_parser(
+        "jrc-histograms",
+        help="Compute the JRC water occurrence histogram of every easement.",
+    )
+    parser_jrc.add_argument("--scale", type=int, default=jrc.HISTOGRAM_SCALE)
+    parser_jrc.add_argument("--workers", type=int, default=4)
+    parser_jrc.add_argument("--path", default=jrc.HISTOGRAM_PATH)
+    parser_jrc.set_defaults(func=jrc_histograms)
+
+    parser_compare = subparsers.add_parser(
+        "summarize-compare",
+        help="Compute new and disappeared water of every easement.",
+    )
+    # Defaults match the compare page.
+    parser_compare.add_argument(
+        "--pre",
+        nargs=2,
+        default=["2014-01-01", "2014-12-31"],
+        metavar=("START", "END"),
+        help="YYYY-MM-DD",
+    )
+    parser_compare.add_argument(
+        "--post",
+        nargs=2,
+        default=["2024-01-01", "2024-12-31"],
+        metavar=("START", "END"),
+        help="YYYY-MM-DD",
+    )
+    parser_compare.add_argument("--pre-cloud-cover", type=int, default=25)
+    parser_compare.add_argument("--post-cloud-cover", type=int, default=30)
+    parser_compare.add_argument("--threshold", type=float, default=0)
+    parser_compare.add_argument("--scale", type=int, default=30)
+    parser_compare.add_argument(
+        "--path", default=compare.SUMMARY_PATH, help="Parquet, or CSV if *.csv"
+    )
+    parser_compare.set_defaults(func=summarize_compare)
+
+    parser_batch = subparsers.add_parser(
+        "compare-batch",
+        help="Run the compare analysis for a CSV of easements and date pairs.",
+    )
+    parser_batch.add_argument("jobs", help="CSV with OBJECTID,pre_start,pre_end,...")
+    parser_batch.add_argument("results", help="JSON lines output, appended to")
+    parser_batch.add_argument("--workers", type=int, default=4)
+    parser_batch.add_argument("--scale", type=int, default=30)
+    parser_batch.add_argument("--retries", type=int, default=runner.MAX_RETRIES)
+    parser_batch.set_defaults(func=compare_batch)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
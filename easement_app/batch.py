@@ -0,0 +1,19 @@
+"""Evaluate several Earth Engine objects in one round trip."""
+
+import ee
+
+
+def evaluate(**objects):
+    """Evaluates the keyword arguments with a single getInfo call.
+
+    Each value may be an ee.ComputedObject or a plain Python value. The result
+    is a dict with the same keys holding the client-side values, e.g.::
+
+        result = evaluate(size=fc.size(), names=fc.aggregate_array("NAME"))
+
+    Values should not evaluate to null; wrap optional results in a list, e.g.
+    ``fc.limit(1).toList(1)``, and check its length instead.
+    """
+    if not objects:
+        return {}
+    return ee.Dictionary(objects).getInfo()
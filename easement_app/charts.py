@@ -0,0 +1,47 @@
+"""Chart widgets that are created once per map and updated in place.
+
+Drawing a new matplotlib figure per click leaks a figure each time and ships a
+fresh PNG to the browser. A bqplot chart keeps one widget alive and only sends
+the new data arrays.
+"""
+
+import bqplot
+import ipywidgets as widgets
+
+
+class BarChart:
+    """A bar chart whose data and labels can be replaced in place."""
+
+    def __init__(self, width="550px", height="350px"):
+        x_scale = bqplot.OrdinalScale()
+        y_scale = bqplot.LinearScale()
+        self.bars = bqplot.Bars(x=[], y=[], scales={"x": x_scale, "y": y_scale})
+        self.x_axis = bqplot.Axis(scale=x_scale, tick_rotate=-90, label_offset="50px")
+        self.y_axis = bqplot.Axis(
+            scale=y_scale, orientation="vertical", label_offset="50px"
+        )
+        self.widget = bqplot.Figure(
+            marks=[self.bars],
+            axes=[self.x_axis, self.y_axis],
+            fig_margin={"top": 10, "bottom": 70, "left": 70, "right": 10},
+            layout=widgets.Layout(width=width, height=height, display="none"),
+        )
+
+    def update(self, x, y, x_label=None, y_label=None, tick_step=1):
+        """Replaces the bars; only every tick_step-th x label is shown."""
+        x = [str(v) for v in x]
+        with self.bars.hold_sync():
+            self.bars.x = x
+            self.bars.y = list(y)
+        self.x_axis.tick_values = x[::tick_step]
+        if x_label is not None:
+            self.x_axis.label = x_label
+        if y_label is not None:
+            self.y_axis.label = y_label
+        self.widget.layout.display = None
+
+    def clear(self):
+        self.widget.layout.display = "none"
+        with self.bars.hold_sync():
+            self.bars.x = []
+            self.bars.y = []
@@ -0,0 +1,169 @@
+"""Pre/post-event composites and NDWI water change, shared by the compare page.
+
+summarize() computes the new and disappeared water of every easement with a
+single reduceRegions call. The compare page exports it with export_summary();
+the command line version is::
+
+    python -m easement_app summarize-compare --pre 2000-05-01 2000-10-01 \
+        --post 2024-05-01 2024-10-01
+"""
+
+import os
+
+import ee
+
+from . import CACHE_DIR, EASEMENT_ASSET
+
+# HLS Landsat 30 m is available from this date; earlier dates use Landsat.
+HLS_START = "2013-04-11"
+HLS_COLLECTION = "NASA/HLS/HLSL30/v002"
+
+VIS_PARAMS = {"bands": ["B6", "B5", "B4"], "min": 0, "max": 0.4}
+
+# Values of the "change" band: 1 + 2 bit flags for pre/post-event water.
+CHANGE_CLASSES = {
+    1: ("Disappeared Water", "a52a2a"),
+    2: ("New Water", "00ffff"),
+    3: ("Persistent Water", "0000ff"),
+}
+
+SUMMARY_PATH = os.path.join(CACHE_DIR, "compare_summary.parquet")
+SUMMARY_COLUMNS = ["OBJECTID", "new_water_ha", "disappeared_water_ha"]
+# Google Drive folder of the summaries exported from the compare page.
+EXPORT_FOLDER = os.environ.get("EASEMENT_APP_EXPORT_FOLDER", "easement-app")
+
+
+def build_collection(roi, start_date, end_date, cloud_cover):
+    """Returns the image collection for a date range with B6/B5/B4/B3 bands.
+
+    start_date and end_date are datetime.date objects.
+    """
+    if start_date.strftime("%Y-%m-%d") < HLS_START:
+        import geemap
+
+        return geemap.landsat_timeseries(
+            roi,
+            start_year=start_date.year,
+            end_year=end_date.year,
+        ).select(["SWIR1", "NIR", "Red", "Green"], ["B6", "B5", "B4", "B3"])
+    return (
+        ee.ImageCollection(HLS_COLLECTION)
+        .filterBounds(roi)
+        .filterDate(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+        .filter(ee.Filter.lt("CLOUD_COVERAGE", cloud_cover))
+    )
+
+
+def water_change(pre_img, post_img, threshold):
+    """Returns a three-band image: pre_ndwi, post_ndwi and the change class.
+
+    The change band is 0 for no water, and 1, 2 or 3 for the keys of
+    CHANGE_CLASSES.
+    """
+    pre_ndwi = pre_img.normalizedDifference(["B3", "B6"])
+    post_ndwi = post_img.normalizedDifference(["B3", "B6"])
+    change = pre_ndwi.gt(threshold).add(post_ndwi.gt(threshold).multiply(2))
+    return ee.Image.cat(
+        [
+            pre_ndwi.rename("pre_ndwi"),
+            post_ndwi.rename("post_ndwi"),
+            change.rename("change"),
+        ]
+    )
+
+
+def water_areas(pre_img, post_img, threshold):
+    """Returns a two-band image with the hectares of new and disappeared water
+    of each pixel, named like SUMMARY_COLUMNS."""
+    change = water_change(pre_img, post_img, threshold).select("change")
+    hectares = ee.Image.pixelArea().divide(1e4)
+    return ee.Image.cat(
+        [
+            hectares.updateMask(change.eq(2)).rename("new_water_ha"),
+            hectares.updateMask(change.eq(1)).rename("disappeared_water_ha"),
+        ]
+    )
+
+
+def change_layer(change_img, classes=None):
+    """Returns (image, vis_params) rendering the selected change classes.
+
+    All classes share one categorical palette, so any subset is drawn by a
+    single tile layer.
+    """
+    if classes is None:
+        classes = list(CHANGE_CLASSES)
+    band = change_img.select("change")
+    image = band.updateMask(band.remap(list(classes), [1] * len(classes), 0))
+    vis_params = {
+        "min": 1,
+        "max": 3,
+        "palette": [CHANGE_CLASSES[i][1] for i in sorted(CHANGE_CLASSES)],
+    }
+    return image, vis_params
+
+
+def summarize(
+    pre_dates,
+    post_dates,
+    pre_cloud_cover=25,
+    post_cloud_cover=30,
+    threshold=0,
+    scale=30,
+    asset_id=EASEMENT_ASSET,
+):
+    """Returns a FeatureCollection with the hectares of new and disappeared
+    water of every easement.
+
+    pre_dates and post_dates are (start, end) tuples of datetime.date objects.
+    The composites cover the whole asset and are reduced over all easements in
+    one reduceRegions call.
+    """
+    fc = ee.FeatureCollection(asset_id)
+    pre_img = build_collection(fc, *pre_dates, pre_cloud_cover).median()
+    post_img = build_collection(fc, *post_dates, post_cloud_cover).median()
+    areas = water_areas(pre_img, post_img, threshold)
+    stats = areas.reduceRegions(
+        collection=fc, reducer=ee.Reducer.sum(), scale=scale, tileScale=4
+    )
+    return stats.select(SUMMARY_COLUMNS, None, False)
+
+
+def export_summary(stats, description="compare_summary", folder=EXPORT_FOLDER):
+    """Starts an Earth Engine batch task that writes a summarize() result as CSV
+    to Google Drive, and returns the task.
+
+    The reduction runs on the batch system, so it is not bound by the
+    interactive request timeout and does not hold an app worker.
+    """
+    task = ee.batch.Export.table.toDrive(
+        collection=stats,
+        description=description,
+        folder=folder,
+        fileNamePrefix=description,
+        fileFormat="CSV",
+        selectors=SUMMARY_COLUMNS,
+    )
+    task.start()
+    return task
+
+
+def write_summary(stats, path=SUMMARY_PATH):
+    """Downloads a summarize() result and writes it as Parquet, or as CSV if the
+    path ends with .csv. Returns the DataFrame."""
+    df = ee.data.computeFeatures(
+        {"expression": stats, "fileFormat": "PANDAS_DATAFRAME"}
+    )
+    df = df.reindex(columns=SUMMARY_COLUMNS).fillna(
+        {"new_water_ha": 0, "disappeared_water_ha": 0}
+    )
+    df["OBJECTID"] = df["OBJECTID"].astype(str)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    if path.endswith(".csv"):
+        df.to_csv(tmp_path, index=False)
+    else:
+        df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return df
@@ -0,0 +1,163 @@
+"""Precomputed annual Landsat composites per easement, stored as local COGs.
+
+The easement set is fixed, so the yearly composites the time slider shows for
+a clicked easement can be produced ahead of time with::
+
+    python -m easement_app precompute-composites --start-year 1984
+
+Files are laid out as ``<store>/<OBJECTID>/<start>_<end>/<year>.tif``, where
+start and end are the month-day window of the composite. Years without any
+Landsat scene get a ``<year>.empty`` marker instead, so they are not retried.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from . import CACHE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, "composites")
+
+BANDS = ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"]
+
+# The window used by the Time slider defaults (May to October).
+DEFAULT_WINDOW = ("05-01", "10-01")
+
+
+def composite_dir(objectid, window=DEFAULT_WINDOW, store=STORE_DIR):
+    return os.path.join(store, str(objectid), f"{window[0]}_{window[1]}")
+
+
+def composite_path(objectid, year, window=DEFAULT_WINDOW, store=STORE_DIR):
+    return os.path.join(composite_dir(objectid, window, store), f"{year}.tif")
+
+
+def cached_frames(
+    objectid, start_year, end_year, window=DEFAULT_WINDOW, store=STORE_DIR
+):
+    """Returns [(year, path), ...] if every year in the range is in the store.
+
+    Years marked as empty are skipped. Returns None if any year is missing.
+    """
+    frames = []
+    for year in range(start_year, end_year + 1):
+        path = composite_path(objectid, year, window, store)
+        if os.path.exists(path):
+            frames.append((year, path))
+        elif not os.path.exists(path[: -len(".tif")] + ".empty"):
+            return None
+    return frames
+
+
+def download_image(image, region, path, scale=30):
+    """Downloads an EE image clipped to region and writes it to path as a COG."""
+    import rasterio.shutil
+    import requests
+
+    url = image.getDownloadURL({"region": region, "scale": scale, "format": "GEO_TIFF"})
+    response = requests.get(url, timeout=600)
+    response.raise_for_status()
+
+    download_path = path + ".download"
+    cog_path = path + ".partial"
+    with open(download_path, "wb") as f:
+        f.write(response.content)
+    rasterio.shutil.copy(download_path, cog_path, driver="COG", compress="DEFLATE")
+    os.remove(download_path)
+    os.replace(cog_path, path)
+
+
+def annual_composite(roi, year, window=DEFAULT_WINDOW):
+    """Returns the Landsat composite of one year, or None if there is no scene."""
+    import ee
+    import geemap
+
+    collection = geemap.landsat_timeseries(
+        roi=roi,
+        start_year=year,
+        end_year=year,
+        start_date=window[0],
+        end_date=window[1],
+        frequency="year",
+    )
+    image = ee.Image(collection.first())
+    if image.bandNames().size().getInfo() == 0:
+        return None
+    return image.select(BANDS).clip(roi)
+
+
+def precompute_easement(
+    objectid,
+    geometry,
+    start_year,
+    end_year,
+    window=DEFAULT_WINDOW,
+    store=STORE_DIR,
+    scale=30,
+    download=download_image,
+):
+    """Writes the missing composites of one easement and returns how many were added.
+
+    geometry is a GeoJSON geometry dict. download(image, region, path, scale)
+    may be replaced, e.g. by a local stand-in in tests.
+    """
+    import ee
+
+    roi = ee.Geometry(geometry)
+    os.makedirs(composite_dir(objectid, window, store), exist_ok=True)
+    count = 0
+    for year in range(start_year, end_year + 1):
+        path = composite_path(objectid, year, window, store)
+        empty_path = path[: -len(".tif")] + ".empty"
+        if os.path.exists(path) or os.path.exists(empty_path):
+            continue
+        image = annual_composite(roi, year, window)
+        if image is None:
+            open(empty_path, "w").close()
+            continue
+        download(image, roi, path, scale)
+        count += 1
+    return count
+
+
+def precompute(
+    index,
+    start_year,
+    end_year,
+    objectids=None,
+    window=DEFAULT_WINDOW,
+    store=STORE_DIR,
+    scale=30,
+    workers=4,
+    download=download_image,
+):
+    """Precomputes composites for every easement of an EasementIndex.
+
+    Already stored years are skipped, so an interrupted run can be restarted.
+    Yields (OBJECTID, number of new files or the exception raised).
+    """
+    features = [index.feature(i) for i in range(len(index))]
+    if objectids is not None:
+        wanted = {str(i) for i in objectids}
+        features = [
+            f for f in features if str(f["properties"].get("OBJECTID")) in wanted
+        ]
+
+    def run(feature):
+        objectid = feature["properties"]["OBJECTID"]
+        try:
+            count = precompute_easement(
+                objectid,
+                feature["geometry"],
+                start_year,
+                end_year,
+                window,
+                store,
+                scale,
+                download,
+            )
+        except Exception as e:
+            return objectid, e
+        return objectid, count
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run, features)
@@ -0,0 +1,129 @@
+"""A thread-safe LRU store of files on disk, bounded by their total size."""
+
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+
+class DiskLRU:
+    """Keeps the most recently used files while their total size fits max_bytes.
+
+    Keys must be safe file names (e.g. hex digests). Entries already in the
+    directory are picked up on start, oldest access first.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        found = []
+        if os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".tmp"):
+                        continue
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, name, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Returns the path of a stored file, or None."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self.path(key)
+        try:
+            # The modification time records the access order across restarts.
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                if key in self._entries:
+                    self._bytes -= self._entries.pop(key)
+            return None
+        return path
+
+    def read(self, key):
+        """Returns the content of a stored file, or None."""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        """Stores bytes under key and returns the path."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._add(key, len(data))
+        return path
+
+    def put_file(self, key, src):
+        """Moves the file src into the store under key and returns the path."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.move(src, path)
+        self._add(key, os.path.getsize(path))
+        return path
+
+    def _add(self, key, size):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._bytes += size
+            evicted = self._evict()
+        for old_key in evicted:
+            try:
+                os.remove(self.path(old_key))
+            except OSError:
+                pass
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the bound.
+        evicted = []
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
@@ -0,0 +1,271 @@
+"""Local copy of the easements asset, indexed for point-in-polygon lookups.
+
+The pages used to ask Earth Engine which easement was clicked, which costs two
+blocking round trips per click. The asset is small and rarely changes, so a
+GeoParquet snapshot is kept on disk and queried with a shapely STRtree instead.
+Run ``python -m easement_app refresh-index`` to (re)build the snapshot.
+
+The same snapshot backs the search box of the pages: easements are found by
+OBJECTID or NEST_AGREE through a hash of the exact values and a sorted list
+for prefix matches, and zoomed to with bounds computed when it is loaded.
+"""
+
+import bisect
+import json
+import math
+import os
+import threading
+
+from . import CACHE_DIR, EASEMENT_ASSET
+
+INDEX_PATH = os.path.join(CACHE_DIR, "easements.parquet")
+
+INFO_FIELDS = ["OBJECTID", "NEST_AGREE", "NEST_RESTO", "ClosingDat", "NEST_Acres"]
+SEARCH_FIELDS = ["OBJECTID", "NEST_AGREE"]
+
+# EE style of the "Easements" layer of every page, also used by the warm-up.
+EASEMENT_STYLE = {
+    "color": "ff0000",
+    "width": 2,
+    "fillColor": "00000020",
+}
+
+# ipyleaflet equivalent of the yellow EE style used for the "Selected" layer.
+SELECTED_STYLE = {
+    "color": "#ffff00",
+    "weight": 2,
+    "fillColor": "#000000",
+    "fillOpacity": 0.125,
+}
+
+
+def _search_key(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip().upper()
+
+
+class EasementIndex:
+    """An STRtree over the easement polygons with their attribute records."""
+
+    def __init__(self, gdf):
+        import shapely
+
+        self.gdf = gdf.reset_index(drop=True)
+        self.tree = shapely.STRtree(self.gdf.geometry.values)
+        self.records = json.loads(
+            self.gdf.drop(columns=self.gdf.geometry.name).to_json(
+                orient="records", date_format="iso"
+            )
+        )
+        # (minx, miny, maxx, maxy) of each easement.
+        self.bounds = self.gdf.geometry.bounds.values
+        self._exact = {}
+        for i, record in enumerate(self.records):
+            for field in SEARCH_FIELDS:
+                key = _search_key(record.get(field))
+                if key:
+                    self._exact.setdefault(key, []).append(i)
+        self._keys = sorted((key, i) for key, hits in self._exact.items() for i in hits)
+
+    @classmethod
+    def from_file(cls, path=INDEX_PATH):
+        import geopandas as gpd
+
+        return cls(gpd.read_parquet(path))
+
+    def __len__(self):
+        return len(self.records)
+
+    def feature(self, i):
+        """Returns the i-th easement as a GeoJSON feature dict."""
+        import shapely
+
+        return {
+            "type": "Feature",
+            "geometry": json.loads(shapely.to_geojson(self.gdf.geometry.iloc[i])),
+            "properties": self.records[i],
+        }
+
+    def search(self, query, limit=10):
+        """Returns the positions of the easements whose OBJECTID or NEST_AGREE
+        equals the query, then of those starting with it."""
+        query = _search_key(query)
+        if not query:
+            return []
+        hits = list(self._exact.get(query, []))
+        start = bisect.bisect_left(self._keys, (query, -1))
+        for key, i in self._keys[start:]:
+            if len(hits) >= limit or not key.startswith(query):
+                break
+            if i not in hits:
+                hits.append(i)
+        return hits[:limit]
+
+    def locate(self, lon, lat):
+        """Returns the position of the easement containing the point, or None."""
+        import shapely
+
+        hits = self.tree.query(shapely.Point(lon, lat), predicate="intersects")
+        if len(hits) == 0:
+            return None
+        # filterBounds().first() returned the feature with the lowest position.
+        return int(hits.min())
+
+
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+
+def get_index(path=INDEX_PATH):
+    """Returns the shared EasementIndex, or None if no snapshot has been built.
+
+    The snapshot is reloaded when the file on disk changes, so a refresh run by
+    another process is picked up without restarting the app.
+    """
+    global _index, _index_mtime
+
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _index_lock:
+        if _index is None or mtime != _index_mtime:
+            _index = EasementIndex.from_file(path)
+            _index_mtime = mtime
+        return _index
+
+
+def refresh_index(path=INDEX_PATH, asset_id=EASEMENT_ASSET):
+    """Downloads the easements asset and atomically replaces the local snapshot.
+
+    Returns the number of features written.
+    """
+    import ee
+
+    gdf = ee.data.computeFeatures(
+        {
+            "expression": ee.FeatureCollection(asset_id),
+            "fileFormat": "GEOPANDAS_GEODATAFRAME",
+        }
+    )
+    if gdf.crs is None:
+        gdf = gdf.set_crs("EPSG:4326")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    gdf.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return len(gdf)
+
+
+def selected_objectid(m):
+    """Returns the OBJECTID of the clicked easement while it is still the map's ROI."""
+    selected = getattr(m, "selected_easement", None)
+    if selected is None or m.user_roi is not getattr(m, "selected_roi", None):
+        return None
+    return selected.get("OBJECTID")
+
+
+def show_info(info, properties):
+    """Replaces the content of an Output widget with the easement attributes."""
+    show_text(info, "".join(f"{f}: {properties.get(f)}\n" for f in INFO_FIELDS))
+
+
+def show_text(info, text):
+    info.outputs = ({"name": "stdout", "output_type": "stream", "text": text},)
+
+
+def fit(bounds, width=600, height=600, max_zoom=18):
+    """Returns the center and the zoom level showing (minx, miny, maxx, maxy)
+    in a map of at least width x height pixels."""
+    west, south, east, north = (float(b) for b in bounds)
+
+    def y(lat):
+        return math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+    zooms = [max_zoom]
+    if east > west:
+        zooms.append(math.log2(width * 360 / (256 * (east - west))))
+    if north > south:
+        zooms.append(math.log2(height * 2 * math.pi / (256 * (y(north) - y(south)))))
+    center = [(south + north) / 2, (west + east) / 2]
+    return center, max(0, int(min(zooms)))
+
+
+def set_selected(m, properties, roi, info):
+    """Makes an easement the map's selection and ROI and shows its attributes.
+
+    The "Selected" layer is drawn by the caller.
+    """
+    m.selected_easement = properties
+    m.selected_roi = roi
+    try:
+        m._draw_control.last_geometry = roi
+    except Exception:
+        pass
+    show_info(info, properties)
+
+
+def select(m, index, i, info, zoom=True):
+    """Shows the i-th easement of the index as the selected one of the map,
+    and zooms to it unless zoom is False."""
+    import ee
+    from ipyleaflet import GeoJSON
+
+    feature = index.feature(i)
+    selected_layer = m.find_layer("Selected")
+    if selected_layer is not None:
+        m.remove_layer(selected_layer)
+    m.add(GeoJSON(data=feature, style=SELECTED_STYLE, name="Selected"))
+    if zoom:
+        m.center, m.zoom = fit(index.bounds[i])
+    set_selected(m, feature["properties"], ee.Geometry(feature["geometry"]), info)
+
+
+def add_search(m, info, on_select=None, position="topleft"):
+    """Adds a box that finds an easement by OBJECTID or NEST_AGREE and selects it.
+
+    on_select() is called before a found easement replaces the selection.
+    """
+    import ipywidgets as widgets
+    from ipyleaflet import WidgetControl
+
+    search = widgets.Text(
+        placeholder="OBJECTID or NEST_AGREE",
+        continuous_update=False,
+        layout=widgets.Layout(width="200px"),
+    )
+    button = widgets.Button(
+        icon="search", tooltip="Search", layout=widgets.Layout(width="36px")
+    )
+
+    def find(query):
+        index = get_index()
+        if index is None:
+            message = "Searching needs the local easement index.\n"
+            hits = []
+        else:
+            hits = index.search(query)
+            message = f"No easement matches {query!r}.\n"
+        if not hits:
+            show_text(info, message)
+            return
+        if on_select is not None:
+            on_select()
+        select(m, index, hits[0], info)
+
+    def submit(query):
+        query = query.strip()
+        if query:
+            m.tasks.submit("search", find, query)
+
+    # The value only changes on Enter or blur; the button repeats a query.
+    search.observe(lambda change: submit(change["new"]), names="value")
+    button.on_click(lambda _: submit(search.value))
+    box = widgets.HBox([search, button])
+    m.add(WidgetControl(widget=box, position=position))
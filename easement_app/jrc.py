@@ -0,0 +1,239 @@
+"""JRC Global Surface Water statistics for the easements.
+
+The water occurrence histogram of an easement never changes, so it is computed
+for all easements ahead of time with::
+
+    python -m easement_app jrc-histograms --workers 8
+
+and stored in a Parquet table keyed by OBJECTID. The Occurrence button reads
+from that table when the ROI is a clicked easement.
+
+The monthly water area history of a ROI is cached incrementally: every month
+of the archive is fetched once, the month range is filtered locally, and a
+refresh only asks Earth Engine for months newer than the last cached one.
+
+For large ROIs, auto_scale() picks a scale that keeps the pixel count within a
+budget, so a quick preview can be shown before the requested scale is done.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import CACHE_DIR
+from .memo import BoundedLRU, stable_hash
+
+JRC_ASSET = "JRC/GSW1_4/GlobalSurfaceWater"
+# Vis params of the occurrence layer, shared by the JRC page and the warm-up.
+OCCURRENCE_VIS = {
+    "min": 0.0,
+    "max": 100.0,
+    "palette": ["ffffff", "ffbbbb", "0000ff"],
+}
+
+HISTOGRAM_PATH = os.path.join(CACHE_DIR, "jrc_histograms.parquet")
+HISTOGRAM_SCALE = 30
+
+HISTORY_DIR = os.path.join(CACHE_DIR, "jrc_monthly")
+HISTORY_START = "1984-03-16"
+# How often a cached history is checked for newly published months.
+HISTORY_REFRESH = float(os.environ.get("JRC_HISTORY_REFRESH", 24 * 3600))
+
+# Pixel budget of the quick preview shown before the requested scale is done.
+PREVIEW_PIXELS = float(os.environ.get("JRC_PREVIEW_PIXELS", 2.5e5))
+
+
+def occurrence_image():
+    import ee
+
+    return ee.Image(JRC_ASSET).select(["occurrence"])
+
+
+def occurrence_histogram(region, scale=HISTOGRAM_SCALE):
+    """Returns the occurrence histogram of a region as a DataFrame (key, value)."""
+    import geemap
+
+    return geemap.image_histogram(
+        occurrence_image(), region, scale=scale, return_df=True
+    )
+
+
+def roi_area(region):
+    """Returns the area of an ee.Geometry in square meters.
+
+    Drawn and clicked ROIs carry their coordinates client-side, so the area is
+    computed locally in an equal-area projection. Computed geometries fall back
+    to a getInfo call.
+    """
+    import ee
+
+    try:
+        geojson = region.toGeoJSON()
+    except (AttributeError, ee.EEException):
+        return region.area(maxError=10).getInfo()
+
+    import geopandas as gpd
+    from shapely.geometry import shape
+
+    series = gpd.GeoSeries([shape(geojson)], crs="EPSG:4326")
+    return float(series.to_crs("EPSG:6933").area.iloc[0])
+
+
+def auto_scale(area, max_pixels, minimum=HISTOGRAM_SCALE):
+    """Returns the smallest scale, in steps of 30 m and not below minimum, at
+    which area holds at most max_pixels pixels."""
+    scale = int(math.ceil(math.sqrt(area / max_pixels) / 30)) * 30
+    return max(minimum, scale)
+
+
+def _init_worker():
+    import geemap
+
+    geemap.ee_initialize()
+
+
+def _easement_histogram(job):
+    import ee
+
+    objectid, geometry, scale = job
+    try:
+        df = occurrence_histogram(ee.Geometry(geometry), scale)
+    except Exception as e:
+        return objectid, None, str(e)
+    df.insert(0, "OBJECTID", str(objectid))
+    return objectid, df, None
+
+
+def build_histogram_table(index, path=HISTOGRAM_PATH, scale=HISTOGRAM_SCALE, workers=4):
+    """Computes the histogram of every easement in a process pool.
+
+    Each worker initializes its own Earth Engine session. Yields
+    (OBJECTID, error or None) as easements finish, then writes the table. If
+    every easement failed, the table on disk is left unchanged.
+    """
+    import pandas as pd
+
+    jobs = []
+    for i in range(len(index)):
+        feature = index.feature(i)
+        jobs.append((feature["properties"]["OBJECTID"], feature["geometry"], scale))
+
+    frames = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for objectid, df, error in pool.map(_easement_histogram, jobs):
+            if df is not None:
+                frames.append(df)
+            yield objectid, error
+
+    if not frames:
+        return
+    table = pd.concat(frames, ignore_index=True)
+    table["scale"] = scale
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    table.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+_histograms = None
+_histograms_mtime = None
+_histograms_lock = threading.Lock()
+
+
+def cached_histogram(objectid, scale=HISTOGRAM_SCALE, path=HISTOGRAM_PATH):
+    """Returns the stored histogram of an easement, or None if not available."""
+    global _histograms, _histograms_mtime
+
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _histograms_lock:
+        if _histograms is None or mtime != _histograms_mtime:
+            import pandas as pd
+
+            table = pd.read_parquet(path)
+            _histograms = {
+                (key, int(table_scale)): df[["key", "value"]].reset_index(drop=True)
+                for (key, table_scale), df in table.groupby(["OBJECTID", "scale"])
+            }
+            _histograms_mtime = mtime
+        return _histograms.get((str(objectid), scale))
+
+
+_histories = BoundedLRU(int(os.environ.get("JRC_HISTORY_BYTES", 16 * 1024 * 1024)))
+_history_locks = {}
+_history_locks_lock = threading.Lock()
+
+
+def _next_month(label):
+    year, month = (int(part) for part in label.split("_"))
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year}-{month:02d}-01"
+
+
+def monthly_history(region, scale, directory=HISTORY_DIR):
+    """Returns the water area (ha) of every archived month for a region.
+
+    The DataFrame has the Month ("YYYY_MM"), Area and month ("MM") columns of
+    geemap.jrc_hist_monthly_history. It is kept in memory and on disk, and is
+    only extended with new months once every HISTORY_REFRESH seconds.
+    """
+    import geemap
+    import pandas as pd
+
+    key = stable_hash(region, scale)
+    with _history_locks_lock:
+        lock = _history_locks.setdefault(key, threading.Lock())
+
+    with lock:
+        path = os.path.join(directory, key + ".parquet")
+        entry = _histories.get(key)
+        if entry is None and os.path.exists(path):
+            entry = (pd.read_parquet(path), os.path.getmtime(path))
+        if entry is not None and time.time() - entry[1] < HISTORY_REFRESH:
+            _histories.put(key, entry, int(entry[0].memory_usage(deep=True).sum()))
+            return entry[0]
+
+        history = entry[0] if entry is not None else None
+        start_date = HISTORY_START
+        if history is not None and len(history):
+            start_date = _next_month(history["Month"].iloc[-1])
+
+        new = geemap.jrc_hist_monthly_history(
+            region=region,
+            start_date=start_date,
+            scale=scale,
+            frequency="month",
+            denominator=1e4,
+            return_df=True,
+        )
+        if history is not None:
+            new = pd.concat([history, new], ignore_index=True)
+        history = new.reset_index(drop=True)
+
+        os.makedirs(directory, exist_ok=True)
+        history.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+        entry = (history, time.time())
+        _histories.put(key, entry, int(history.memory_usage(deep=True).sum()))
+        return history
+
+
+def history_cached(region, scale, directory=HISTORY_DIR):
+    """Returns True if monthly_history() has the region in memory or on disk,
+    so at most the newest months are left to fetch."""
+    key = stable_hash(region, scale)
+    if _histories.get(key) is not None:
+        return True
+    return os.path.exists(os.path.join(directory, key + ".parquet"))
+
+
+def filter_months(history, start_month, end_month):
+    """Returns the rows of a monthly history within a calendar month range."""
+    months = history["month"].astype(int)
+    return history[months.between(start_month, end_month)].reset_index(drop=True)
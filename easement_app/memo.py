@@ -0,0 +1,69 @@
+"""A thread-safe LRU cache bounded by an estimate of the bytes it holds."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def stable_hash(*parts):
+    """Returns a hex digest of JSON-serializable parts; EE objects are serialized."""
+    digest = hashlib.sha1()
+    for part in parts:
+        if hasattr(part, "serialize"):
+            part = part.serialize()
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class BoundedLRU:
+    """Keeps the most recently used entries while their total size fits max_bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def resize(self, key, size):
+        """Updates the recorded size of an entry that grew after insertion."""
+        with self._lock:
+            if key in self._entries:
+                value, old_size = self._entries[key]
+                self._entries[key] = (value, size)
+                self._bytes += size - old_size
+                self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the bound.
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,296 @@
+"""Latency and call-count metrics in the Prometheus text format.
+
+Recorded:
+
+- every Earth Engine request (the ee.data functions routed through the
+  scheduler) and the geemap helpers that issue them, with the time spent
+  waiting for a scheduler slot reported separately;
+- every map callback run by a TaskGroup.
+
+Each is labeled with the page and the action (the task key) it ran for, and
+has a latency histogram, an error counter and an in-flight gauge. asgi.py
+serves render() at /metrics next to the Solara app.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import math
+import threading
+import time
+
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# geemap helpers that evaluate on the Earth Engine servers.
+GEEMAP_FUNCTIONS = [
+    "image_histogram",
+    "jrc_hist_monthly_history",
+    "landsat_timeseries",
+    "naip_timeseries",
+]
+
+_context = contextvars.ContextVar("easement_app_metrics", default=("", ""))
+_registry = []
+_install_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """A gauge set with inc()/dec(), or read from a function at render time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=(), function=None):
+        super().__init__(name, help, labels)
+        self.function = function
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+    def render(self):
+        if self.function is not None:
+            with self._lock:
+                self._values = dict(self.function())
+        return super().render()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def observe(self, labels, value):
+        with self._lock:
+            counts, total = self._values.get(labels, ([0] * (len(BUCKETS) + 1), 0.0))
+            counts[bisect.bisect_left(BUCKETS, value)] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self):
+        with self._lock:
+            items = sorted(
+                (labels, (list(counts), total))
+                for labels, (counts, total) in self._values.items()
+            )
+        lines = self._header()
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (math.inf,), counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.labels, labels, [('le', le)])} {cumulative}"
+                )
+            label_text = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+EE_SECONDS = Histogram(
+    "easement_app_ee_request_seconds",
+    "Duration of Earth Engine requests and geemap helpers.",
+    ["operation", "page", "action"],
+)
+EE_ERRORS = Counter(
+    "easement_app_ee_request_errors_total",
+    "Earth Engine requests and geemap helpers that raised.",
+    ["operation", "page", "action"],
+)
+EE_IN_FLIGHT = Gauge(
+    "easement_app_ee_requests_in_flight",
+    "Earth Engine requests and geemap helpers running now.",
+    ["operation"],
+)
+EE_QUEUE_SECONDS = Histogram(
+    "easement_app_ee_queue_seconds",
+    "Time Earth Engine requests waited for a scheduler slot.",
+    ["page", "action"],
+)
+CALLBACK_SECONDS = Histogram(
+    "easement_app_callback_seconds",
+    "Duration of map callbacks.",
+    ["page", "action"],
+)
+CALLBACK_ERRORS = Counter(
+    "easement_app_callback_errors_total",
+    "Map callbacks that raised.",
+    ["page", "action"],
+)
+CALLBACK_IN_FLIGHT = Gauge(
+    "easement_app_callbacks_in_flight",
+    "Map callbacks running now.",
+    ["page", "action"],
+)
+
+
+def _scheduler_stats():
+    from . import scheduler
+
+    stats = scheduler.get_scheduler().stats()
+    return {(state,): value for state, value in stats.items()}
+
+
+def _session_counts():
+    from . import sessions
+
+    counts = {}
+    for session in sessions.stats(memory=False):
+        key = (session["page"],)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _session_bytes():
+    from . import sessions
+
+    totals = {}
+    for session in sessions.stats():
+        key = (session["page"],)
+        totals[key] = totals.get(key, 0) + session["bytes"]
+    return totals
+
+
+Gauge(
+    "easement_app_scheduler_requests",
+    "Earth Engine requests running or waiting in the scheduler.",
+    ["state"],
+    function=_scheduler_stats,
+)
+Gauge(
+    "easement_app_sessions",
+    "Live sessions per page.",
+    ["page"],
+    function=_session_counts,
+)
+Gauge(
+    "easement_app_session_bytes",
+    "Estimated memory held by the widgets of the live sessions, per page.",
+    ["page"],
+    function=_session_bytes,
+)
+
+
+@contextlib.contextmanager
+def labels(page, action):
+    """Labels the metrics recorded in the block with a page and an action."""
+    token = _context.set((page, action))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current_labels():
+    return _context.get()
+
+
+@contextlib.contextmanager
+def track_ee(operation):
+    page, action = _context.get()
+    EE_IN_FLIGHT.inc((operation,))
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        EE_ERRORS.inc((operation, page, action))
+        raise
+    finally:
+        EE_SECONDS.observe((operation, page, action), time.perf_counter() - start)
+        EE_IN_FLIGHT.dec((operation,))
+
+
+@contextlib.contextmanager
+def track_callback(page, action):
+    CALLBACK_IN_FLIGHT.inc((page, action))
+    start = time.perf_counter()
+    try:
+        with labels(page, action):
+            yield
+    except BaseException:
+        CALLBACK_ERRORS.inc((page, action))
+        raise
+    finally:
+        CALLBACK_SECONDS.observe((page, action), time.perf_counter() - start)
+        CALLBACK_IN_FLIGHT.dec((page, action))
+
+
+def observe_queue(seconds):
+    EE_QUEUE_SECONDS.observe(_context.get(), seconds)
+
+
+def _tracked(operation, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with track_ee(operation):
+            return fn(*args, **kwargs)
+
+    wrapper.__tracked__ = True
+    return wrapper
+
+
+def install():
+    """Records the geemap helpers that evaluate on Earth Engine (once)."""
+    import geemap
+
+    with _install_lock:
+        for name in GEEMAP_FUNCTIONS:
+            fn = getattr(geemap, name, None)
+            if fn is not None and not getattr(fn, "__tracked__", False):
+                setattr(geemap, name, _tracked(name, fn))
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+async def endpoint(request):
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import PlainTextResponse
+
+    # render() walks the widget state of every session; keep it off the loop.
+    text = await run_in_threadpool(render)
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
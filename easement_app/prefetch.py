@@ -0,0 +1,123 @@
+"""Background tile prefetching for the frames of a time slider.
+
+While a slider shows frame i, the tiles of the current viewport are fetched
+for frames i+1, i-1, i+2, ... up to PREFETCH_FRAMES away, nearest first, on a
+small shared thread pool. Moving the slider, panning or zooming starts over
+for the new position, and work for the old one is dropped.
+
+Tiles are warmed in the disk cache of the tile proxy, so prefetching needs
+EASEMENT_APP_TILE_PROXY=1. Without the proxy, only the tile URLs (map IDs) of
+the neighbouring frames are resolved ahead of time.
+"""
+
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import scheduler, tileproxy
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_FRAMES = int(os.environ.get("EASEMENT_APP_PREFETCH_FRAMES", 3))
+PREFETCH_WORKERS = int(os.environ.get("EASEMENT_APP_PREFETCH_WORKERS", 4))
+# Upper bound of tiles warmed per frame, for very large viewports.
+MAX_TILES = int(os.environ.get("EASEMENT_APP_PREFETCH_TILES", 64))
+
+_executor = ThreadPoolExecutor(
+    max_workers=PREFETCH_WORKERS, thread_name_prefix="easement-app-prefetch"
+)
+
+
+def _tile_xy(lat, lon, z):
+    n = 2**z
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def viewport_tiles(bounds, zoom, limit=MAX_TILES):
+    """Returns the (z, x, y) tiles covering ((south, west), (north, east)),
+    closest to the center first."""
+    (south, west), (north, east) = bounds
+    z = int(round(zoom))
+    x0, y0 = _tile_xy(north, west, z)
+    x1, y1 = _tile_xy(south, east, z)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    tiles = [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+    tiles.sort(key=lambda t: (t[1] - cx) ** 2 + (t[2] - cy) ** 2)
+    return tiles[:limit]
+
+
+def neighbours(index, count, radius):
+    """Returns the frame indexes around index, nearest first, next before previous."""
+    order = []
+    for step in range(1, radius + 1):
+        for i in (index + step, index - step):
+            if 0 <= i < count:
+                order.append(i)
+    return order
+
+
+class TilePrefetcher:
+    """Warms the tiles of the frames around the current one of a slider.
+
+    frame_url(i) returns the tile URL template of frame i.
+    """
+
+    def __init__(self, m, frame_url, count, radius=PREFETCH_FRAMES):
+        self.m = m
+        self.frame_url = frame_url
+        self.count = count
+        self.radius = radius
+        self.index = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        m.observe(self._viewport_changed, names=["bounds", "zoom"])
+
+    def goto(self, index):
+        self.index = index
+        self._schedule()
+
+    def stop(self):
+        with self._lock:
+            self._generation += 1
+        try:
+            self.m.unobserve(self._viewport_changed, names=["bounds", "zoom"])
+        except ValueError:
+            pass
+
+    def _viewport_changed(self, change):
+        self._schedule()
+
+    def _current(self, generation):
+        return generation == self._generation
+
+    def _schedule(self):
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        bounds = self.m.bounds
+        if not bounds or self.radius <= 0:
+            return
+        tiles = viewport_tiles(bounds, self.m.zoom)
+        for i in neighbours(self.index, self.count, self.radius):
+            _executor.submit(self._warm_frame, generation, i, tiles)
+
+    def _warm_frame(self, generation, index, tiles):
+        if not self._current(generation):
+            return
+        try:
+            with scheduler.priority(scheduler.BACKGROUND):
+                url = self.frame_url(index)
+            key = tileproxy.layer_key(url)
+            if key is None:
+                return
+            for z, x, y in tiles:
+                if not self._current(generation):
+                    return
+                tileproxy.get_tile(key, z, x, y)
+        except Exception:
+            logger.debug("Prefetching frame %d failed", index, exc_info=True)
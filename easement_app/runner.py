@@ -0,0 +1,184 @@
+"""Headless, resumable runner of the compare page's pre/post water analysis.
+
+A CSV job file lists one analysis per row::
+
+    OBJECTID,pre_start,pre_end,post_start,post_end
+
+with optional pre_cloud_cover, post_cloud_cover and threshold columns (the
+compare page defaults apply otherwise). Run it with::
+
+    python -m easement_app compare-batch jobs.csv results.jsonl --workers 8
+
+Every finished item is appended to the results file (JSON lines) right away.
+Items already in that file are skipped, so a crashed run resumes where it
+stopped. Earth Engine quota errors are retried with exponential backoff.
+
+Earth Engine is only imported inside the functions that use it, so a local
+stand-in ``ee`` module placed in sys.modules is picked up instead.
+"""
+
+import csv
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+DEFAULTS = {"pre_cloud_cover": 25, "post_cloud_cover": 30, "threshold": 0.0}
+
+MAX_RETRIES = int(os.environ.get("EASEMENT_APP_MAX_RETRIES", 6))
+BACKOFF = float(os.environ.get("EASEMENT_APP_BACKOFF", 2.0))
+
+QUOTA_MESSAGES = (
+    "too many concurrent",
+    "quota",
+    "rate limit",
+    "resource_exhausted",
+    "429",
+)
+
+
+def read_jobs(path):
+    """Returns the jobs of a CSV file as a list of dicts."""
+    jobs = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            job = {"OBJECTID": str(row["OBJECTID"])}
+            for name in ["pre_start", "pre_end", "post_start", "post_end"]:
+                job[name] = date.fromisoformat(row[name].strip())
+            for name, default in DEFAULTS.items():
+                value = (row.get(name) or "").strip()
+                job[name] = type(default)(value) if value else default
+            jobs.append(job)
+    return jobs
+
+
+def job_key(job):
+    return "|".join(
+        str(job[name])
+        for name in [
+            "OBJECTID",
+            "pre_start",
+            "pre_end",
+            "post_start",
+            "post_end",
+            "pre_cloud_cover",
+            "post_cloud_cover",
+            "threshold",
+        ]
+    )
+
+
+def completed_keys(path):
+    """Returns the keys of the items already written to a results file."""
+    keys = set()
+    if not os.path.exists(path):
+        return keys
+    with open(path) as f:
+        for line in f:
+            try:
+                keys.add(json.loads(line)["key"])
+            except (ValueError, KeyError):
+                # A line cut short by a crash; the item is simply redone.
+                continue
+    return keys
+
+
+def _end_line(path):
+    """Terminates a last line cut short by a crash, so the next record starts
+    on a line of its own."""
+    try:
+        with open(path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+
+def is_quota_error(e):
+    message = str(e).lower()
+    return any(text in message for text in QUOTA_MESSAGES)
+
+
+def with_backoff(fn, retries=MAX_RETRIES, backoff=BACKOFF, sleep=time.sleep):
+    """Calls fn(), retrying quota errors after backoff * 2**attempt seconds."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not is_quota_error(e):
+                raise
+            sleep(backoff * 2**attempt * (1 + random.random() / 2))
+
+
+def analyze(job, geometry, scale=30):
+    """Returns the hectares of new and disappeared water of one job."""
+    import ee
+
+    from . import compare
+
+    roi = ee.Geometry(geometry)
+    pre_img = compare.build_collection(
+        roi, job["pre_start"], job["pre_end"], job["pre_cloud_cover"]
+    ).median()
+    post_img = compare.build_collection(
+        roi, job["post_start"], job["post_end"], job["post_cloud_cover"]
+    ).median()
+    areas = compare.water_areas(pre_img, post_img, job["threshold"])
+    stats = areas.reduceRegion(
+        reducer=ee.Reducer.sum(), geometry=roi, scale=scale, maxPixels=1e10
+    ).getInfo()
+    return {name: stats.get(name) or 0 for name in compare.SUMMARY_COLUMNS[1:]}
+
+
+def run(
+    jobs,
+    index,
+    results_path,
+    workers=4,
+    scale=30,
+    retries=MAX_RETRIES,
+    analyze=analyze,
+):
+    """Runs the jobs not yet in results_path with a bounded thread pool.
+
+    index is an EasementIndex providing the geometries. Yields (key, result
+    dict or the exception raised). Failed items are not recorded, so they are
+    tried again on the next run.
+    """
+    done = completed_keys(results_path)
+    geometries = {
+        str(record.get("OBJECTID")): i for i, record in enumerate(index.records)
+    }
+    pending = [job for job in jobs if job_key(job) not in done]
+
+    os.makedirs(os.path.dirname(os.path.abspath(results_path)), exist_ok=True)
+    _end_line(results_path)
+    lock = threading.Lock()
+
+    def run_job(job):
+        key = job_key(job)
+        try:
+            if job["OBJECTID"] not in geometries:
+                raise KeyError(f"OBJECTID {job['OBJECTID']} not in the index")
+            geometry = index.feature(geometries[job["OBJECTID"]])["geometry"]
+            result = with_backoff(lambda: analyze(job, geometry, scale), retries)
+        except Exception as e:
+            return key, e
+
+        record = {"key": key, **job, **result}
+        with lock:
+            with open(results_path, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        return key, result
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run_job, pending)
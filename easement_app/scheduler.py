@@ -0,0 +1,188 @@
+"""Process-wide scheduler for Earth Engine requests.
+
+All sessions of the app and any background work in the server process share
+one Earth Engine quota. install() routes the request functions of ee.data
+(computeValue behind getInfo, getMapId, computeFeatures, thumbnails and
+downloads) through a single Scheduler, so geemap helpers such as
+image_histogram or landsat_timeseries are covered too.
+
+The scheduler admits requests in priority order, at most MAX_CONCURRENT at a
+time and at most RATE per second on average (token bucket of BURST tokens).
+The last RESERVED slots are kept for interactive requests, and background
+requests may use at most half of the slots, so a heavy chart or a batch job
+cannot starve the click lookups of other users.
+
+The priority of a request is taken from the calling context::
+
+    with scheduler.priority(scheduler.BACKGROUND):
+        image.getInfo()
+
+TaskGroup sets it for the tasks it runs; the default is INTERACTIVE.
+"""
+
+import contextlib
+import contextvars
+import functools
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from . import metrics
+
+INTERACTIVE = 0
+CHART = 1
+BACKGROUND = 2
+
+RATE = float(os.environ.get("EE_RATE", 50))
+BURST = float(os.environ.get("EE_BURST", 50))
+MAX_CONCURRENT = int(os.environ.get("EE_MAX_CONCURRENT", 20))
+RESERVED = int(os.environ.get("EE_RESERVED", 2))
+
+# ee.data functions that each cost one request to the Earth Engine servers.
+EE_FUNCTIONS = [
+    "computeValue",
+    "computeFeatures",
+    "computePixels",
+    "computeImages",
+    "getMapId",
+    "getThumbId",
+    "getVideoThumbId",
+    "getFilmstripThumbId",
+    "getDownloadId",
+    "getTableDownloadId",
+]
+
+_priority = contextvars.ContextVar("easement_app_priority", default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def priority(level):
+    """Runs the Earth Engine requests of the block at the given priority."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+class Scheduler:
+    """Priority admission with a concurrency cap and a token-bucket rate limit."""
+
+    def __init__(
+        self,
+        rate=RATE,
+        burst=BURST,
+        max_concurrent=MAX_CONCURRENT,
+        reserved=RESERVED,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.reserved = reserved
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _limit(self, level):
+        if level <= INTERACTIVE:
+            return self.max_concurrent
+        if level == CHART:
+            return max(1, self.max_concurrent - self.reserved)
+        return max(1, self.max_concurrent // 2)
+
+    def _take_token(self):
+        """Takes a token and returns 0, or returns the seconds until one is due."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self, level=None):
+        if level is None:
+            level = current_priority()
+        entry = (level, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            # A more urgent request may now be first in line.
+            self._cond.notify_all()
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] == entry and self._running < self._limit(level):
+                        timeout = self._take_token()
+                        if timeout == 0:
+                            break
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiting)
+            self._running += 1
+            self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, level=None):
+        self.acquire(level)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def call(self, fn, *args, **kwargs):
+        with self.slot():
+            return fn(*args, **kwargs)
+
+    def stats(self):
+        with self._cond:
+            return {"running": self._running, "waiting": len(self._waiting)}
+
+
+_scheduler = Scheduler()
+_install_lock = threading.Lock()
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def _scheduled(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        with _scheduler.slot():
+            metrics.observe_queue(time.perf_counter() - start)
+            with metrics.track_ee(fn.__name__):
+                return fn(*args, **kwargs)
+
+    wrapper.__scheduled__ = True
+    return wrapper
+
+
+def install():
+    """Routes the request functions of ee.data through the scheduler (once)."""
+    import ee
+
+    with _install_lock:
+        for name in EE_FUNCTIONS:
+            fn = getattr(ee.data, name, None)
+            if fn is not None and not getattr(fn, "__scheduled__", False):
+                setattr(ee.data, name, _scheduled(fn))
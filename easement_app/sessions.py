@@ -0,0 +1,248 @@
+"""Lifecycle of the per-session maps: idle teardown, a live-session cap and
+memory accounting.
+
+Every page map calls register(self); a session tracks all the maps created in
+one Solara kernel. When the kernel closes, its maps are torn down explicitly:
+pending tasks are cancelled, layers, controls and interaction callbacks are
+removed and Output buffers are cleared, so nothing keeps the Earth Engine
+objects and widgets of a closed tab alive.
+
+A reaper thread closes sessions without any activity (a map callback, a click,
+pan or zoom of a map, or a slider move) for IDLE_TIMEOUT seconds. When more
+than MAX_SESSIONS are live, the least recently used sessions that have been
+idle for at least EVICT_IDLE seconds are closed to make room. stats() reports an estimate of the memory held by each session.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+IDLE_TIMEOUT = float(os.environ.get("EASEMENT_APP_IDLE_TIMEOUT", 30 * 60))
+EVICT_IDLE = float(os.environ.get("EASEMENT_APP_EVICT_IDLE", 5 * 60))
+MAX_SESSIONS = int(os.environ.get("EASEMENT_APP_MAX_SESSIONS", 50))
+CHECK_INTERVAL = float(os.environ.get("EASEMENT_APP_SESSION_CHECK", 60))
+
+_sessions = {}
+_lock = threading.Lock()
+_reaper = None
+
+
+MAP_TRAITS = ["bounds", "zoom", "center"]
+
+
+class Session:
+    def __init__(self, context):
+        self.maps = weakref.WeakSet()
+        self.context = context
+        self.page = None
+        self.created = time.time()
+        self.last_active = time.monotonic()
+
+    def touch(self, *args, **kwargs):
+        self.last_active = time.monotonic()
+
+    def idle(self, now=None):
+        return (now or time.monotonic()) - self.last_active
+
+
+def _current_context():
+    try:
+        from solara.server import kernel_context
+
+        return kernel_context.get_current_context()
+    except (ImportError, RuntimeError):
+        return None
+
+
+def register(m):
+    """Tracks a page map and tears it down when its kernel closes."""
+    context = _current_context()
+    if context is None:
+        return
+    with _lock:
+        session = _sessions.get(context.id)
+        new = session is None
+        if new:
+            session = _sessions[context.id] = Session(context)
+        session.maps.add(m)
+        session.page = type(m).__module__
+    session.touch()
+    # Map interaction counts as activity even when it runs no task.
+    m.on_interaction(session.touch)
+    m.observe(session.touch, names=MAP_TRAITS)
+    if not new:
+        return
+    context.on_close(lambda: _closed(context.id))
+    _start_reaper()
+    _enforce_limit(context.id)
+
+
+def touch():
+    """Marks the session of the calling kernel as active."""
+    context = _current_context()
+    if context is None:
+        return
+    with _lock:
+        session = _sessions.get(context.id)
+    if session is not None:
+        session.touch()
+
+
+def _closed(kernel_id):
+    with _lock:
+        session = _sessions.pop(kernel_id, None)
+    if session is None:
+        return
+    for m in list(session.maps):
+        teardown(m, session.touch)
+
+
+def teardown(m, handler=None):
+    """Releases the layers, controls and buffers of a map, and the activity
+    handler register() attached to it."""
+    group = getattr(m, "tasks", None)
+    if group is not None:
+        group.cancel_all()
+    if handler is not None:
+        m.on_interaction(handler, remove=True)
+        m.unobserve(handler, names=MAP_TRAITS)
+    for control in list(m.controls):
+        widget = getattr(control, "widget", None)
+        if widget is not None:
+            _clear_outputs(widget)
+        m.remove_control(control)
+    for layer in list(m.layers)[1:]:
+        m.remove_layer(layer)
+    for name in ["ee_layers", "geojson_layers"]:
+        value = getattr(m, name, None)
+        if isinstance(value, dict):
+            value.clear()
+    for name in ["selected_roi", "selected_easement", "change_image", "user_roi"]:
+        if name in m.__dict__:
+            m.__dict__[name] = None
+
+
+def _clear_outputs(widget):
+    children = getattr(widget, "children", None)
+    if children:
+        for child in children:
+            _clear_outputs(child)
+    if hasattr(widget, "outputs"):
+        widget.outputs = ()
+
+
+def _close(session, reason):
+    logger.info(
+        "Closing %s session %s (%s, idle %.0fs)",
+        session.page,
+        session.context.id,
+        reason,
+        session.idle(),
+    )
+    try:
+        session.context.close(reason)
+    except TypeError:
+        session.context.close()
+    except Exception:
+        logger.exception("Failed to close session %s", session.context.id)
+
+
+def _enforce_limit(keep_id):
+    with _lock:
+        excess = len(_sessions) - MAX_SESSIONS
+        now = time.monotonic()
+        candidates = sorted(
+            (
+                s
+                for kernel_id, s in _sessions.items()
+                if kernel_id != keep_id and s.idle(now) >= EVICT_IDLE
+            ),
+            key=lambda s: s.last_active,
+        )
+    if excess <= 0:
+        return
+    if len(candidates) < excess:
+        logger.warning(
+            "%d live sessions exceed the limit of %d; only %d are idle",
+            excess + MAX_SESSIONS,
+            MAX_SESSIONS,
+            len(candidates),
+        )
+    for session in candidates[:excess]:
+        _close(session, "evicted")
+
+
+def _reap():
+    while True:
+        time.sleep(CHECK_INTERVAL)
+        now = time.monotonic()
+        with _lock:
+            idle = [s for s in _sessions.values() if s.idle(now) >= IDLE_TIMEOUT]
+        for session in idle:
+            _close(session, "cull")
+
+
+def _start_reaper():
+    global _reaper
+    with _lock:
+        if _reaper is None:
+            _reaper = threading.Thread(
+                target=_reap, name="easement-app-sessions", daemon=True
+            )
+            _reaper.start()
+
+
+def _state_size(value, depth=0):
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    if isinstance(value, str):
+        return len(value)
+    if depth > 20:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sum(_state_size(v, depth + 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_state_size(v, depth + 1) for v in value)
+    return sys.getsizeof(value)
+
+
+def session_bytes(context):
+    """Estimates the bytes held by the widgets of a kernel from their state."""
+    total = 0
+    for widget in list(context.widgets.values()):
+        try:
+            total += _state_size(widget.get_state())
+        except Exception:
+            continue
+    return total
+
+
+def stats(memory=True):
+    """Returns one dict per live session: page of the latest map, idle seconds,
+    widget, map and layer counts and, with memory=True, estimated bytes."""
+    now = time.monotonic()
+    with _lock:
+        sessions = list(_sessions.values())
+    result = []
+    for session in sessions:
+        maps = list(session.maps)
+        entry = {
+            "kernel_id": session.context.id,
+            "page": session.page,
+            "age": time.time() - session.created,
+            "idle": session.idle(now),
+            "widgets": len(session.context.widgets),
+            "maps": len(maps),
+            "layers": sum(len(m.layers) for m in maps),
+        }
+        if memory:
+            entry["bytes"] = session_bytes(session.context)
+        result.append(entry)
+    return result
@@ -0,0 +1,314 @@
+"""Time sliders that swap the URL of a single tile layer.
+
+geemap's add_time_slider re-adds an Earth Engine layer on every step and
+gives the browser no chance to fetch a frame ahead of time. These sliders
+resolve the tile URL of each frame once and let a TilePrefetcher warm the
+tiles of the neighbouring frames in the background.
+"""
+
+import threading
+import time
+
+import ee
+import geemap
+import ipywidgets as widgets
+from ipyleaflet import (
+    FullScreenControl,
+    ScaleControl,
+    SplitMapControl,
+    TileLayer,
+    WidgetControl,
+    ZoomControl,
+)
+
+from . import composites, sessions, tasks, tiles
+from .prefetch import TilePrefetcher
+
+
+def _frames(collection, labels, vis_params, region=None):
+    if isinstance(region, ee.Geometry):
+        collection = collection.map(lambda img: img.clip(region))
+    elif isinstance(region, ee.FeatureCollection):
+        collection = collection.map(lambda img: img.clipToCollection(region))
+    frames = tiles.FrameUrls(collection, len(labels), vis_params)
+    if tiles.RESOLVE_FRAMES:
+        frames.resolve_all()
+    return frames
+
+
+def remove_time_slider(m, layer_name="Time series"):
+    """Removes the time slider control and every layer named layer_name.
+
+    Removing the layer of an Earth Engine slider also stops its prefetcher and
+    drops its pending frame requests.
+    """
+    slider_ctrl = getattr(m, "slider_ctrl", None)
+    if slider_ctrl is not None:
+        if slider_ctrl in m.controls:
+            m.remove(slider_ctrl)
+        delattr(m, "slider_ctrl")
+    for layer in [layer for layer in m.layers if layer.name == layer_name]:
+        m.remove(layer)
+
+
+def add_cog_time_slider(
+    m,
+    frames,
+    bands,
+    vmin=0,
+    vmax=0.4,
+    layer_name="Time series",
+    position="bottomright",
+    slider_length="150px",
+):
+    """Adds a time slider over precomputed composites to the map.
+
+    frames is a list of (label, path) tuples as returned by
+    composites.cached_frames(). The control is stored as m.slider_ctrl, like
+    geemap's add_time_slider, so the pages' clean-up code removes it. A
+    previous slider of the map is removed first.
+    """
+    remove_time_slider(m, layer_name)
+    indexes = [composites.BANDS.index(b) + 1 for b in bands]
+    urls = {}
+
+    def frame_url(i):
+        if i not in urls:
+            urls[i] = geemap.get_local_tile_layer(
+                frames[i][1],
+                indexes=indexes,
+                vmin=vmin,
+                vmax=vmax,
+                layer_name=layer_name,
+                quiet=True,
+            ).url
+        return urls[i]
+
+    layer = TileLayer(
+        url=frame_url(0),
+        name=layer_name,
+        attribution="Landsat composite",
+        max_zoom=24,
+    )
+    m.add(layer)
+
+    slider = widgets.IntSlider(
+        min=1,
+        max=len(frames),
+        readout=False,
+        continuous_update=False,
+        layout=widgets.Layout(width=slider_length),
+    )
+    label = widgets.Label(
+        value=str(frames[0][0]), layout=widgets.Layout(padding="0px 5px 0px 5px")
+    )
+    close_btn = widgets.Button(
+        icon="times",
+        tooltip="Close the time slider",
+        button_style="primary",
+        layout=widgets.Layout(width="32px"),
+    )
+
+    def slider_changed(change):
+        index = change["new"] - 1
+        label.value = str(frames[index][0])
+        layer.url = frame_url(index)
+        sessions.touch()
+
+    slider.observe(slider_changed, "value")
+
+    slider_ctrl = WidgetControl(
+        widget=widgets.HBox([slider, label, close_btn]), position=position
+    )
+
+    def close_btn_click(b):
+        m.remove(slider_ctrl)
+        if layer in m.layers:
+            m.remove(layer)
+        if getattr(m, "slider_ctrl", None) is slider_ctrl:
+            delattr(m, "slider_ctrl")
+
+    close_btn.on_click(close_btn_click)
+
+    m.add(slider_ctrl)
+    m.slider_ctrl = slider_ctrl
+
+
+def add_ee_time_slider(
+    m,
+    collection,
+    labels,
+    vis_params,
+    region=None,
+    layer_name="Time series",
+    time_interval=1,
+    position="bottomright",
+    slider_length="150px",
+):
+    """Adds a time slider over the images of an ee.ImageCollection to the map.
+
+    labels holds one label per image, e.g. TimeSeries.dates(). Frames are
+    shown through the process-wide tile URL cache, and the tiles of the frames
+    around the current one are prefetched for the visible part of the map.
+    A previous slider of the map is removed first.
+    """
+    remove_time_slider(m, layer_name)
+    frames = _frames(collection, labels, vis_params, region)
+    layer = TileLayer(
+        url=frames.url(0),
+        name=layer_name,
+        attribution="Google Earth Engine",
+        max_zoom=24,
+    )
+    m.add(layer)
+    prefetcher = TilePrefetcher(m, frames.url, len(labels))
+
+    def layers_changed(change):
+        if layer not in change["new"]:
+            playing.clear()
+            prefetcher.stop()
+            frames.cancel()
+            m.unobserve(layers_changed, names="layers")
+
+    m.observe(layers_changed, names="layers")
+
+    slider = widgets.IntSlider(
+        min=1,
+        max=len(labels),
+        readout=False,
+        continuous_update=False,
+        layout=widgets.Layout(width=slider_length),
+    )
+    label = widgets.Label(
+        value=str(labels[0]), layout=widgets.Layout(padding="0px 5px 0px 5px")
+    )
+    play_btn = widgets.Button(
+        icon="play",
+        tooltip="Play the time slider",
+        button_style="primary",
+        layout=widgets.Layout(width="32px"),
+    )
+    pause_btn = widgets.Button(
+        icon="pause",
+        tooltip="Pause the time slider",
+        button_style="primary",
+        layout=widgets.Layout(width="32px"),
+    )
+    close_btn = widgets.Button(
+        icon="times",
+        tooltip="Close the time slider",
+        button_style="primary",
+        layout=widgets.Layout(width="32px"),
+    )
+    playing = threading.Event()
+
+    def show(index):
+        url = frames.url(index)
+        if tasks.stale():
+            return
+        layer.url = url
+
+    def slider_changed(change):
+        index = change["new"] - 1
+        label.value = str(labels[index])
+        prefetcher.goto(index)
+        m.tasks.submit("slider", show, index)
+
+    slider.observe(slider_changed, "value")
+
+    def play(b):
+        if playing.is_set():
+            return
+        playing.set()
+
+        def work():
+            while playing.is_set() and layer in m.layers:
+                slider.value = slider.value % len(labels) + 1
+                time.sleep(time_interval)
+            playing.clear()
+
+        threading.Thread(target=work, daemon=True).start()
+
+    play_btn.on_click(play)
+    pause_btn.on_click(lambda b: playing.clear())
+
+    slider_ctrl = WidgetControl(
+        widget=widgets.HBox([slider, label, play_btn, pause_btn, close_btn]),
+        position=position,
+    )
+
+    def close_btn_click(b):
+        m.remove(slider_ctrl)
+        if layer in m.layers:
+            m.remove(layer)
+        if getattr(m, "slider_ctrl", None) is slider_ctrl:
+            delattr(m, "slider_ctrl")
+
+    close_btn.on_click(close_btn_click)
+
+    m.add(slider_ctrl)
+    m.slider_ctrl = slider_ctrl
+    prefetcher.goto(0)
+
+
+def add_ee_split_inspector(
+    m, collection, labels, vis_params, width="130px", left_index=0, right_index=-1
+):
+    """Compares two images of an ee.ImageCollection side by side.
+
+    Like geemap's ts_inspector, but the labels are given instead of fetched,
+    and the frames are shown through the process-wide tile URL cache.
+    """
+    frames = _frames(collection, labels, vis_params)
+    controls = m.controls
+    layers = m.layers
+    m.clear_controls()
+
+    def side(index, position):
+        layer = TileLayer(
+            url=frames.url(index % len(labels)),
+            name=str(labels[index]),
+            attribution="Google Earth Engine",
+            max_zoom=24,
+        )
+        dropdown = widgets.Dropdown(options=labels, value=labels[index])
+        dropdown.layout.max_width = width
+
+        def show(i):
+            url = frames.url(i)
+            if tasks.stale():
+                return
+            layer.url = url
+            layer.name = str(labels[i])
+
+        def dropdown_changed(change):
+            if dropdown.index is not None:
+                m.tasks.submit(f"split-{position}", show, dropdown.index)
+
+        dropdown.observe(dropdown_changed, names="value")
+        m.add(WidgetControl(widget=dropdown, position=position))
+        return layer
+
+    left_layer = side(left_index, "topleft")
+    right_layer = side(right_index, "topright")
+    m.add(ZoomControl(position="topleft"))
+    m.add(ScaleControl(position="bottomleft"))
+    m.add(FullScreenControl())
+    m.add(SplitMapControl(left_layer=left_layer, right_layer=right_layer))
+
+    close_button = widgets.ToggleButton(
+        value=False,
+        tooltip="Close the tool",
+        icon="times",
+        layout=widgets.Layout(height="28px", width="28px", padding="0px 0px 0px 4px"),
+    )
+
+    def close_btn_click(change):
+        if change["new"]:
+            frames.cancel()
+            m.controls = controls
+            m.clear_layers()
+            m.layers = layers
+
+    close_button.observe(close_btn_click, "value")
+    m.add(WidgetControl(widget=close_button, position="bottomright"))
@@ -0,0 +1,124 @@
+"""Run widget callbacks on a shared thread pool, latest request wins.
+
+Callbacks that block on Earth Engine used to run on the widget thread, so three
+quick clicks were served one after another. Now each map owns a TaskGroup and
+submits its callbacks under a key (e.g. "click" or "chart"). Submitting again
+under the same key cancels the previous task if it has not started yet, and
+marks it stale if it has, so it can drop its result instead of touching the UI.
+
+Tasks run their Earth Engine requests at the scheduler priority of their key,
+so click lookups go ahead of charts, and charts ahead of batch work.
+"""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics, scheduler, sessions
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.environ.get("EASEMENT_APP_WORKERS", 8))
+
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="easement-app-task"
+)
+_current = contextvars.ContextVar("easement_app_task", default=None)
+
+# Scheduler priority per task key; other keys run at scheduler.CHART.
+PRIORITIES = {
+    "click": scheduler.INTERACTIVE,
+    "classes": scheduler.INTERACTIVE,
+    "search": scheduler.INTERACTIVE,
+    "slider": scheduler.INTERACTIVE,
+    "summarize": scheduler.BACKGROUND,
+}
+
+
+def _kernel_context():
+    """Returns the Solara kernel context of the caller, so widget updates made
+    from a pool thread reach the right browser tab."""
+    try:
+        from solara.server import kernel_context
+
+        return kernel_context.get_current_context()
+    except (ImportError, RuntimeError):
+        return contextlib.nullcontext()
+
+
+class TaskGroup:
+    """Latest-request-wins scheduling for the callbacks of one map."""
+
+    def __init__(self, page="", priorities=None):
+        scheduler.install()
+        metrics.install()
+        self.page = page
+        self.priorities = dict(PRIORITIES, **(priorities or {}))
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._futures = {}
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) in the pool, superseding earlier tasks for key."""
+        sessions.touch()
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+            future = _executor.submit(
+                self._run, _kernel_context(), key, generation, fn, args, kwargs
+            )
+            self._futures[key] = future
+        return future
+
+    def wrap(self, key, fn):
+        """Returns a callback that submits fn under key, for widget on_click."""
+
+        @functools.wraps(fn)
+        def callback(*args, **kwargs):
+            return self.submit(key, fn, *args, **kwargs)
+
+        return callback
+
+    def cancel_all(self):
+        """Cancels pending tasks and marks running ones stale."""
+        with self._lock:
+            for key, future in self._futures.items():
+                future.cancel()
+                self._generations[key] += 1
+            self._futures.clear()
+
+    def is_current(self, key, generation):
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def _run(self, context, key, generation, fn, args, kwargs):
+        token = _current.set((self, key, generation))
+        try:
+            with context, scheduler.priority(
+                self.priorities.get(key, scheduler.CHART)
+            ), metrics.track_callback(self.page, key):
+                return fn(*args, **kwargs)
+        except Exception:
+            logger.exception("Task %r failed", key)
+        finally:
+            _current.reset(token)
+
+
+def stale():
+    """Returns True if the running task has been superseded by a newer one.
+
+    Call it after a slow Earth Engine request and before updating widgets.
+    Outside of a task it always returns False.
+    """
+    current = _current.get()
+    if current is None:
+        return False
+    group, key, generation = current
+    return not group.is_current(key, generation)
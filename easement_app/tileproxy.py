@@ -0,0 +1,149 @@
+"""Optional caching proxy for the map tiles of the pages.
+
+With EASEMENT_APP_TILE_PROXY=1 (and the app served through asgi.py), tile
+layers point at ``/tiles/<layer>/<z>/<x>/<y>`` instead of the upstream server.
+<layer> is a hash of the layer expression and vis params for Earth Engine
+layers, or of the URL template for basemaps, so a refreshed map ID keeps
+using the tiles already cached. The upstream URL templates are kept in a
+size-bounded in-memory LRU, so layers of closed sessions are dropped. Tiles are kept in a size-bounded LRU on disk
+and shared by all sessions, and concurrent requests for the same tile wait
+for a single upstream fetch.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import Future
+
+from . import CACHE_DIR
+from .diskcache import DiskLRU
+from .memo import BoundedLRU
+
+ENABLED = os.environ.get("EASEMENT_APP_TILE_PROXY", "0") == "1"
+# Public URL prefix of the proxy route, as seen by the browser.
+URL_PREFIX = os.environ.get("EASEMENT_APP_TILE_PROXY_URL", "/tiles")
+TILE_DIR = os.path.join(CACHE_DIR, "tiles")
+TILE_BYTES = int(os.environ.get("EASEMENT_APP_TILE_BYTES", 1024**3))
+UPSTREAM_BYTES = int(os.environ.get("EASEMENT_APP_TILE_UPSTREAM_BYTES", 4 * 1024**2))
+TIMEOUT = 30
+
+_upstreams = BoundedLRU(UPSTREAM_BYTES)
+_inflight = {}
+_lock = threading.Lock()
+_store = None
+
+
+def get_store():
+    global _store
+    with _lock:
+        if _store is None:
+            _store = DiskLRU(TILE_DIR, TILE_BYTES)
+        return _store
+
+
+def layer_url(layer_key, upstream):
+    """Registers the upstream URL template of a layer and returns the proxy
+    URL template. Returns upstream unchanged when the proxy is disabled."""
+    if not ENABLED:
+        return upstream
+    _upstreams.put(layer_key, upstream, len(upstream))
+    return f"{URL_PREFIX}/{layer_key}/{{z}}/{{x}}/{{y}}"
+
+
+def layer_key(url):
+    """Returns the layer key of a proxy URL template, or None."""
+    prefix = URL_PREFIX + "/"
+    if not url.startswith(prefix):
+        return None
+    return url[len(prefix) :].split("/", 1)[0]
+
+
+def proxy_layers(m):
+    """Routes the plain tile layers of a map (e.g. basemaps) through the proxy."""
+    if not ENABLED:
+        return
+    for layer in m.layers:
+        url = getattr(layer, "url", "")
+        if url.startswith(("http://", "https://")) and "{z}" in url:
+            layer_key = hashlib.sha1(url.encode()).hexdigest()
+            layer.url = layer_url(layer_key, url)
+
+
+def fetch_upstream(url):
+    """Returns (status, content) of an upstream tile request."""
+    import requests
+
+    response = requests.get(url, timeout=TIMEOUT)
+    return response.status_code, response.content
+
+
+def _tile_url(upstream, z, x, y):
+    return (
+        upstream.replace("{z}", str(z))
+        .replace("{x}", str(x))
+        .replace("{y}", str(y))
+        .replace("{s}", "a")
+    )
+
+
+def get_tile(layer_key, z, x, y):
+    """Returns the tile bytes, or None if the layer is unknown or the upstream
+    server has no tile."""
+    store = get_store()
+    key = f"{layer_key}-{z}-{x}-{y}"
+    content = store.read(key)
+    if content is not None:
+        return content
+
+    with _lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            upstream = _upstreams.get(layer_key)
+            if upstream is None:
+                return None
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        status, content = fetch_upstream(_tile_url(upstream, z, x, y))
+        if status != 200 or not content:
+            content = None
+        else:
+            store.put(key, content)
+        future.set_result(content)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+    return content
+
+
+def media_type(content):
+    if content.startswith(b"\x89PNG"):
+        return "image/png"
+    if content.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if content[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+async def endpoint(request):
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import Response
+
+    params = request.path_params
+    content = await run_in_threadpool(
+        get_tile, params["layer"], params["z"], params["x"], params["y"]
+    )
+    if content is None:
+        return Response(status_code=404)
+    return Response(
+        content,
+        media_type=media_type(content),
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
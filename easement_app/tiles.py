@@ -0,0 +1,171 @@
+"""Process-wide cache of Earth Engine tile URLs.
+
+Every new session adds the same static layers (the easement outlines, the JRC
+occurrence image), and each one used to cost a ``getMapId`` round trip. The
+tile URL only depends on the serialized expression and the vis params, so it is
+computed once and shared by all sessions until shortly before the map token
+expires.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ee
+import ipyleaflet
+from geemap import ee_tile_layers
+
+from . import scheduler, tileproxy
+
+# EE map tokens stay valid for several hours; refresh well before that.
+TILE_URL_TTL = float(os.environ.get("EE_TILE_URL_TTL", 3600))
+# With EASEMENT_APP_RESOLVE_FRAMES=1, time sliders and split maps request the
+# map IDs of all their frames up front, FRAME_WORKERS at a time.
+RESOLVE_FRAMES = os.environ.get("EASEMENT_APP_RESOLVE_FRAMES", "0") == "1"
+FRAME_WORKERS = int(os.environ.get("EASEMENT_APP_FRAME_WORKERS", 8))
+
+_cache = {}
+_key_locks = {}
+_lock = threading.Lock()
+_frame_executor = ThreadPoolExecutor(
+    max_workers=FRAME_WORKERS, thread_name_prefix="easement-app-frames"
+)
+
+
+def _cache_key(image, vis_params):
+    return image.serialize() + json.dumps(vis_params, sort_keys=True, default=str)
+
+
+def _proxied(key, url):
+    return tileproxy.layer_url(hashlib.sha1(key.encode()).hexdigest(), url)
+
+
+def _prune(now):
+    for key in [k for k, (_, expires) in _cache.items() if expires <= now]:
+        del _cache[key]
+        _key_locks.pop(key, None)
+
+
+def get_tile_url(ee_object, vis_params=None, refresh=False):
+    """Returns the tile URL format for an EE object, reusing a cached map ID.
+
+    With refresh=True a new map ID is requested and replaces the cached one.
+    """
+    vis_params = ee_tile_layers._validate_vis_params(vis_params)
+    image = ee.Image(ee_tile_layers._ee_object_to_image(ee_object, vis_params))
+    key = _cache_key(image, vis_params)
+
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    # Concurrent sessions asking for the same layer wait for a single getMapId.
+    with key_lock:
+        now = time.monotonic()
+        with _lock:
+            entry = _cache.get(key)
+        if entry is not None and entry[1] > now and not refresh:
+            return _proxied(key, entry[0])
+
+        url = image.getMapId(vis_params)["tile_fetcher"].url_format
+        with _lock:
+            _prune(now)
+            _cache[key] = (url, now + TILE_URL_TTL)
+            _key_locks.setdefault(key, key_lock)
+        return _proxied(key, url)
+
+
+class FrameUrls:
+    """Tile URLs of the images of an ee.ImageCollection, by frame index."""
+
+    def __init__(self, collection, count, vis_params=None):
+        self.images = collection.toList(count)
+        self.count = count
+        self.vis_params = vis_params
+        self._urls = {}
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def url(self, index):
+        with self._lock:
+            url = self._urls.get(index)
+        if url is None:
+            url = get_tile_url(ee.Image(self.images.get(index)), self.vis_params)
+            with self._lock:
+                self._urls[index] = url
+        return url
+
+    def _resolve(self, index):
+        with scheduler.priority(scheduler.BACKGROUND):
+            self.url(index)
+
+    def resolve_all(self):
+        """Requests the map IDs of all frames concurrently in the background."""
+        with self._lock:
+            self._futures = [
+                _frame_executor.submit(self._resolve, index)
+                for index in range(self.count)
+                if index not in self._urls
+            ]
+
+    def cancel(self):
+        """Drops the map ID requests that have not started yet."""
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _key_locks.clear()
+
+
+class CachedTileLayer(ee_tile_layers.EELeafletTileLayer):
+    """An EELeafletTileLayer whose tile URL comes from the shared cache."""
+
+    def __init__(
+        self,
+        ee_object,
+        vis_params=None,
+        name="Layer untitled",
+        shown=True,
+        opacity=1.0,
+        **kwargs,
+    ):
+        self._ee_object = ee_object
+        self.url_format = get_tile_url(ee_object, vis_params)
+        ipyleaflet.TileLayer.__init__(
+            self,
+            url=self.url_format,
+            attribution="Google Earth Engine",
+            name=name,
+            opacity=opacity,
+            visible=shown,
+            max_zoom=24,
+            **kwargs,
+        )
+
+
+def add_layer(m, ee_object, vis_params=None, name=None, shown=True, opacity=1.0):
+    """Same as geemap.Map.add_layer, but with a cached tile URL."""
+    if vis_params is None:
+        vis_params = {}
+    if name is None:
+        name = f"Layer {len(m.ee_layers) + 1}"
+
+    tile_layer = CachedTileLayer(ee_object, vis_params, name, shown, opacity)
+
+    m.remove(name)
+    m.ee_layers[name] = {
+        "ee_object": ee_object,
+        "ee_layer": tile_layer,
+        "vis_params": vis_params,
+    }
+    m.add(tile_layer)
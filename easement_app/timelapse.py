@@ -0,0 +1,294 @@
+"""Landsat timelapse videos streamed from frame thumbnails into ffmpeg.
+
+geemap's timelapse renders one GIF on the server, downloads it, then rewrites
+it frame by frame to add the labels and converts it to MP4 in another pass.
+Here every year is requested as its own PNG thumbnail, WORKERS at a time, and
+each labeled frame is written straight to the stdin of an ffmpeg process as
+raw RGB. Frames are encoded in order as they arrive, and at most 2 * WORKERS
+of them are held in memory.
+
+Finished videos are kept on disk under a hash of the ROI and every render
+option, in a size-bounded LRU shared by all sessions, so a repeated request
+is served without rendering.
+"""
+
+import collections
+import io
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import ee
+
+from . import CACHE_DIR, scheduler, timeseries
+from .diskcache import DiskLRU
+from .memo import stable_hash
+
+WORKERS = int(os.environ.get("EASEMENT_APP_TIMELAPSE_WORKERS", 8))
+DIMENSIONS = int(os.environ.get("EASEMENT_APP_TIMELAPSE_DIMENSIONS", 768))
+TIMEOUT = 120
+RENDER_DIR = os.path.join(CACHE_DIR, "timelapse")
+RENDER_BYTES = int(os.environ.get("EASEMENT_APP_TIMELAPSE_BYTES", 2 * 1024**3))
+
+FORMATS = {
+    "mp4": {
+        "format": "mp4",
+        "vcodec": "libx264",
+        "pix_fmt": "yuv420p",
+        "movflags": "+faststart",
+    },
+    "webm": {
+        "format": "webm",
+        "vcodec": "libvpx-vp9",
+        "pix_fmt": "yuv420p",
+        "crf": 32,
+        "b:v": 0,
+    },
+}
+
+_executor = ThreadPoolExecutor(
+    max_workers=WORKERS, thread_name_prefix="easement-app-timelapse"
+)
+# A lock per video while it is rendered or awaited; dropped once unused.
+_key_locks = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+_store = None
+
+
+def get_store():
+    global _store
+    with _lock:
+        if _store is None:
+            _store = DiskLRU(RENDER_DIR, RENDER_BYTES)
+        return _store
+
+
+def frame_images(collection, bands, nd_bands=None, nd_threshold=0, nd_color="blue"):
+    """Returns the collection as RGB images, with the pixels above the
+    normalized difference threshold painted in nd_color."""
+
+    def visualize(image):
+        rgb = image.visualize(bands=bands, min=0, max=0.4, gamma=[1, 1, 1])
+        if nd_bands is None:
+            return rgb
+        mask = image.normalizedDifference(nd_bands).gt(nd_threshold).selfMask()
+        return rgb.blend(mask.visualize(palette=[nd_color]))
+
+    return collection.map(visualize)
+
+
+def iter_frames(fetch, count, workers=WORKERS):
+    """Yields fetch(0), ..., fetch(count - 1) in order, computed on the pool
+    with at most 2 * workers of them pending or unconsumed."""
+    pending = collections.deque()
+    index = 0
+    try:
+        while index < count or pending:
+            while index < count and len(pending) < 2 * workers:
+                pending.append(_executor.submit(fetch, index))
+                index += 1
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def annotate(frame, text, progress, font_size, font_color, bar_color):
+    """Draws the label and a progress bar on a PIL image."""
+    from PIL import ImageDraw, ImageFont
+
+    draw = ImageDraw.Draw(frame)
+    font = ImageFont.load_default(size=font_size)
+    draw.text((10, 10), text, fill=font_color, font=font)
+    if progress is not None:
+        width, height = frame.size
+        draw.rectangle([0, height - 5, int(width * progress), height], fill=bar_color)
+    return frame
+
+
+def download(url):
+    import requests
+
+    response = requests.get(url, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def _abort(process, out_path):
+    if process is not None:
+        process.kill()
+        process.wait()
+    if os.path.exists(out_path):
+        os.remove(out_path)
+
+
+def encode(frames, out_path, fps=10, format="mp4", cancelled=None):
+    """Streams PIL images into ffmpeg and writes a video to out_path.
+
+    Returns out_path, or None if cancelled() returned True before the end.
+    """
+    import ffmpeg
+
+    process = None
+    try:
+        for frame in frames:
+            if cancelled is not None and cancelled():
+                _abort(process, out_path)
+                return None
+            if process is None:
+                size = frame.size
+                process = (
+                    ffmpeg.input(
+                        "pipe:",
+                        format="rawvideo",
+                        pix_fmt="rgb24",
+                        s="{}x{}".format(*size),
+                        framerate=fps,
+                    )
+                    .output(
+                        out_path,
+                        vf="pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                        **FORMATS[format],
+                    )
+                    .global_args("-loglevel", "error")
+                    .overwrite_output()
+                    .run_async(pipe_stdin=True, pipe_stderr=True)
+                )
+            if frame.size != size:
+                frame = frame.resize(size)
+            process.stdin.write(frame.tobytes())
+    except BrokenPipeError as e:
+        error = process.stderr.read().decode()
+        _abort(process, out_path)
+        raise RuntimeError(f"ffmpeg failed: {error}") from e
+    except BaseException:
+        _abort(process, out_path)
+        raise
+    finally:
+        if hasattr(frames, "close"):
+            frames.close()
+
+    if process is None:
+        raise ValueError("No frames to encode")
+    process.stdin.close()
+    error = process.stderr.read().decode()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed: {error}")
+    return out_path
+
+
+def render(
+    roi,
+    out_path,
+    start_year,
+    end_year,
+    start_date,
+    end_date,
+    bands,
+    format="mp4",
+    title="Timelapse",
+    fps=10,
+    dimensions=DIMENSIONS,
+    apply_fmask=True,
+    nd_bands=None,
+    nd_threshold=0,
+    nd_color="blue",
+    font_size=30,
+    font_color="white",
+    progress_bar_color="blue",
+    progress=None,
+    cancelled=None,
+):
+    """Renders a yearly Landsat timelapse of roi to out_path.
+
+    progress(done, total) is called after each encoded frame. Returns
+    out_path, or None if cancelled() returned True.
+    """
+    from PIL import Image
+
+    series = timeseries.landsat_timeseries(
+        roi, start_year, end_year, start_date, end_date, apply_fmask=apply_fmask
+    )
+    labels = series.dates("YYYY")
+    images = frame_images(
+        series.collection, bands, nd_bands, nd_threshold, nd_color
+    ).toList(len(labels))
+    params = {"region": roi, "dimensions": dimensions, "format": "png"}
+
+    def fetch(index):
+        with scheduler.priority(scheduler.CHART):
+            url = ee.Image(images.get(index)).getThumbURL(params)
+        frame = Image.open(io.BytesIO(download(url))).convert("RGB")
+        text = f"{title} {labels[index]}".strip()
+        bar = (index + 1) / len(labels) if len(labels) > 1 else None
+        return annotate(frame, text, bar, font_size, font_color, progress_bar_color)
+
+    def frames():
+        for done, frame in enumerate(iter_frames(fetch, len(labels)), 1):
+            yield frame
+            if progress is not None:
+                progress(done, len(labels))
+
+    return encode(frames(), out_path, fps, format, cancelled)
+
+
+def cached_render(
+    roi,
+    start_year,
+    end_year,
+    start_date,
+    end_date,
+    bands,
+    progress=None,
+    cancelled=None,
+    **options,
+):
+    """Returns the path of the timelapse video, rendering it on first request.
+
+    options are passed on to render(). Concurrent requests for the same video
+    wait for a single render. Returns None if cancelled() returned True.
+    """
+    options.setdefault("format", "mp4")
+    options.setdefault("dimensions", DIMENSIONS)
+    key = stable_hash(
+        roi, "landsat", start_year, end_year, start_date, end_date, bands, options
+    )
+    key = f"{key}.{options['format']}"
+    store = get_store()
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        path = store.get(key)
+        if path is not None:
+            return path
+        os.makedirs(RENDER_DIR, exist_ok=True)
+        tmp_path = os.path.join(RENDER_DIR, f"{key}.{threading.get_ident()}.tmp")
+        rendered = render(
+            roi,
+            tmp_path,
+            start_year,
+            end_year,
+            start_date,
+            end_date,
+            bands,
+            progress=progress,
+            cancelled=cancelled,
+            **options,
+        )
+        if rendered is None:
+            return None
+        return store.put_file(key, rendered)
+
+
+def bounds(roi):
+    """Returns ((south, west), (north, east)) of an ee.Geometry."""
+    try:
+        from shapely.geometry import shape
+
+        west, south, east, north = shape(roi.toGeoJSON()).bounds
+    except ee.EEException:
+        coords = roi.bounds().getInfo()["coordinates"][0]
+        west, south = min(c[0] for c in coords), min(c[1] for c in coords)
+        east, north = max(c[0] for c in coords), max(c[1] for c in coords)
+    return ((south, west), (north, east))
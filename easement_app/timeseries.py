@@ -0,0 +1,88 @@
+"""Memoized Landsat and NAIP time series for the time sliders and split maps.
+
+``geemap.landsat_timeseries`` builds a large expression graph and resolving its
+frame dates costs a getInfo call. Both only depend on the ROI and the slider
+parameters, so they are kept in a process-wide LRU keyed by a hash of both.
+"""
+
+import os
+import threading
+
+import geemap
+
+from . import batch
+from .memo import BoundedLRU, stable_hash
+
+MEMO_BYTES = int(os.environ.get("EASEMENT_APP_MEMO_BYTES", 64 * 1024 * 1024))
+
+_cache = BoundedLRU(MEMO_BYTES)
+
+
+class TimeSeries:
+    """An image collection together with its lazily resolved frame dates."""
+
+    def __init__(self, key, collection):
+        self.key = key
+        self.collection = collection
+        self.nbytes = len(collection.serialize())
+        self._dates = {}
+        self._lock = threading.Lock()
+
+    def dates(self, date_format):
+        """Returns the frame dates, fetching them on first use."""
+        with self._lock:
+            if date_format not in self._dates:
+                result = batch.evaluate(
+                    dates=geemap.image_dates(self.collection, date_format)
+                )
+                self._dates[date_format] = result["dates"]
+                self.nbytes += sum(len(d) for d in result["dates"])
+                _cache.resize(self.key, self.nbytes)
+            return self._dates[date_format]
+
+
+def landsat_timeseries(
+    roi,
+    start_year,
+    end_year,
+    start_date,
+    end_date,
+    frequency="year",
+    apply_fmask=True,
+):
+    """Returns the memoized TimeSeries for geemap.landsat_timeseries(...)."""
+    key = stable_hash(
+        roi,
+        "landsat",
+        start_year,
+        end_year,
+        start_date,
+        end_date,
+        frequency,
+        apply_fmask,
+    )
+    series = _cache.get(key)
+    if series is None:
+        collection = geemap.landsat_timeseries(
+            roi=roi,
+            start_year=start_year,
+            end_year=end_year,
+            start_date=start_date,
+            end_date=end_date,
+            apply_fmask=apply_fmask,
+            frequency=frequency,
+        )
+        series = TimeSeries(key, collection)
+        _cache.put(key, series, series.nbytes)
+    return series
+
+
+def naip_timeseries(roi, RGBN=False):
+    """Returns the memoized TimeSeries for geemap.naip_timeseries(...)."""
+    key = stable_hash(roi, "naip", RGBN)
+    series = _cache.get(key)
+    if series is None:
+        collection = geemap.naip_timeseries(roi, RGBN=RGBN)
+        series = TimeSeries(key, collection)
+        _cache.put(key, series, series.nbytes)
+    return series
@@ -0,0 +1,7 @@
+"""The Map classes of the pages.
+
+The modules under pages/ only define the Solara Page components, which import
+their Map class from here when the route is first rendered. Solara imports all
+page modules at startup, so earthengine-api, geemap, ipyleaflet and friends are
+now only loaded once a map page is visited.
+"""
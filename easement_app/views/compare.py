@@ -0,0 +1,437 @@
+import os
+import ee
+import geemap
+import ipywidgets as widgets
+from IPython.display import display
+from datetime import date
+from ipyleaflet import WidgetControl
+from .. import (
+    EASEMENT_ASSET,
+    batch,
+    compare,
+    easements,
+    sessions,
+    tasks,
+    tileproxy,
+    tiles,
+)
+
+
+class Map(geemap.Map):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = tasks.TaskGroup(page="compare")
+        sessions.register(self)
+        self.add_basemap("Esri.WorldImagery")
+        tileproxy.proxy_layers(self)
+
+        easement = ee.FeatureCollection(EASEMENT_ASSET)
+        tiles.add_layer(
+            self, easement.style(**easements.EASEMENT_STYLE), {}, "Easements"
+        )
+        self.add_gui_widget(add_header=True)
+
+        info = widgets.Output()
+        info_ctrl = WidgetControl(widget=info, position="bottomright")
+        self.add(info_ctrl)
+        easements.add_search(self, info)
+
+        def handle_click(latlon):
+            selected_layer = self.find_layer("Selected")
+            if selected_layer is not None:
+                self.remove_layer(selected_layer)
+            self.default_style = {"cursor": "wait"}
+            index = easements.get_index()
+            if index is not None:
+                i = index.locate(*latlon[::-1])
+                if i is not None:
+                    easements.select(self, index, i, info, zoom=False)
+            else:
+                clicked_point = ee.Geometry.Point(latlon[::-1])
+                selected = easement.filterBounds(clicked_point)
+                result = batch.evaluate(
+                    size=selected.size(),
+                    info=selected.limit(1)
+                    .toList(1)
+                    .map(lambda f: ee.Feature(f).toDictionary()),
+                )
+                if tasks.stale():
+                    return
+                if result["size"] > 0:
+
+                    selected_style = {
+                        "color": "ffff00",
+                        "width": 2,
+                        "fillColor": "00000020",
+                    }
+                    tiles.add_layer(
+                        self, selected.style(**selected_style), {}, "Selected"
+                    )
+                    easements.set_selected(
+                        self, result["info"][0], selected.geometry(), info
+                    )
+
+            self.default_style = {"cursor": "default"}
+
+        def handle_interaction(**kwargs):
+            if kwargs.get("type") == "click":
+                self.tasks.submit("click", handle_click, kwargs.get("coordinates"))
+
+        self.on_interaction(handle_interaction)
+
+    def clean_up(self):
+
+        layers = [
+            "Pre-event Image",
+            "Post-event Image",
+            "Pre-event NDWI",
+            "Post-event NDWI",
+            "Pre-event Water",
+            "Post-event Water",
+            "Disappeared Water",
+            "New Water",
+            "Water Change",
+            "Selected",
+        ]
+        for layer_name in layers:
+            layer = self.find_layer(layer_name)
+            if layer is not None:
+                self.remove(layer)
+
+        if getattr(self, "change_legend", None) in self.controls:
+            self.remove_control(self.change_legend)
+
+    def add_gui_widget(self, position="topright", **kwargs):
+
+        widget = widgets.VBox(layout=widgets.Layout(padding="0px 5px 0px 5px"))
+        pre_widget = widgets.HBox()
+        post_widget = widgets.HBox()
+        layout = widgets.Layout(width="auto")
+        style = {"description_width": "initial"}
+        padding = "0px 5px 0px 5px"
+        pre_start_date = widgets.DatePicker(
+            description="Start",
+            value=date(2014, 1, 1),
+            style=style,
+            layout=widgets.Layout(padding=padding, width="160px"),
+        )
+        pre_end_date = widgets.DatePicker(
+            description="End",
+            value=date(2014, 12, 31),
+            style=style,
+            layout=widgets.Layout(padding=padding, width="160px"),
+        )
+        pre_cloud_cover = widgets.IntSlider(
+            description="Cloud",
+            min=0,
+            max=100,
+            value=25,
+            step=1,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(padding=padding, width="130px"),
+        )
+        pre_cloud_label = widgets.Label(value=str(pre_cloud_cover.value))
+        geemap.jslink_slider_label(pre_cloud_cover, pre_cloud_label)
+        pre_widget.children = [
+            pre_start_date,
+            pre_end_date,
+            pre_cloud_cover,
+            pre_cloud_label,
+        ]
+        post_start_date = widgets.DatePicker(
+            description="Start",
+            value=date(2024, 1, 1),
+            style=style,
+            layout=widgets.Layout(padding=padding, width="160px"),
+        )
+        post_end_date = widgets.DatePicker(
+            description="End",
+            value=date(2024, 12, 31),
+            style=style,
+            layout=widgets.Layout(padding=padding, width="160px"),
+        )
+        post_cloud_cover = widgets.IntSlider(
+            description="Cloud",
+            min=0,
+            max=100,
+            value=30,
+            step=1,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(padding=padding, width="130px"),
+        )
+        post_cloud_label = widgets.Label(value=str(post_cloud_cover.value))
+        geemap.jslink_slider_label(post_cloud_cover, post_cloud_label)
+        post_widget.children = [
+            post_start_date,
+            post_end_date,
+            post_cloud_cover,
+            post_cloud_label,
+        ]
+
+        apply_btn = widgets.Button(description="Apply", layout=layout)
+        summarize_btn = widgets.Button(
+            description="Summarize all easements",
+            tooltip="Export the water change of every easement to Google Drive",
+            layout=layout,
+        )
+        reset_btn = widgets.Button(description="Reset", layout=layout)
+        buttons = widgets.HBox([apply_btn, summarize_btn, reset_btn])
+        output = widgets.Output()
+
+        use_split = widgets.Checkbox(
+            value=False,
+            description="Split map",
+            style=style,
+            layout=widgets.Layout(padding=padding, width="100px"),
+        )
+
+        use_ndwi = widgets.Checkbox(
+            value=False,
+            description="Compute NDWI",
+            style=style,
+            layout=widgets.Layout(padding=padding, width="160px"),
+        )
+
+        ndwi_threhold = widgets.FloatSlider(
+            description="Threshold",
+            min=-1,
+            max=1,
+            value=0,
+            step=0.05,
+            readout=True,
+            style=style,
+            layout=widgets.Layout(padding=padding, width="230px"),
+        )
+
+        use_combined = widgets.Checkbox(
+            value=True,
+            description="Single water layer",
+            style=style,
+            layout=widgets.Layout(padding=padding, width="160px"),
+        )
+
+        options = widgets.HBox(
+            [
+                use_split,
+                use_ndwi,
+                ndwi_threhold,
+            ]
+        )
+
+        class_checks = {}
+        legend_items = []
+        for value, (name, color) in compare.CHANGE_CLASSES.items():
+            class_checks[value] = widgets.Checkbox(
+                value=True,
+                description=name,
+                indent=False,
+                layout=widgets.Layout(width="auto"),
+            )
+            swatch = widgets.HTML(
+                f'<div style="width:14px;height:14px;margin:6px 4px;background:#{color}"></div>'
+            )
+            legend_items.append(widgets.HBox([swatch, class_checks[value]]))
+        change_legend = WidgetControl(
+            widget=widgets.VBox(legend_items), position="bottomleft"
+        )
+        self.change_legend = change_legend
+
+        def checked_classes():
+            return [value for value, check in class_checks.items() if check.value]
+
+        def update_change_layer():
+            layer_dict = self.ee_layers.get("Water Change")
+            if layer_dict is None:
+                return
+            classes = checked_classes()
+            if classes:
+                image, change_vis = compare.change_layer(self.change_image, classes)
+                # Shared tile URL cache: a combination seen before costs nothing.
+                url = tiles.get_tile_url(image, change_vis)
+                if tasks.stale():
+                    return
+                layer_dict["ee_layer"].url = url
+            layer_dict["ee_layer"].visible = bool(classes)
+
+        for check in class_checks.values():
+            check.observe(
+                lambda change: self.tasks.submit("classes", update_change_layer),
+                "value",
+            )
+
+        widget.children = [
+            pre_widget,
+            post_widget,
+            options,
+            use_combined,
+            buttons,
+            output,
+        ]
+        self.add_widget(widget, position=position, **kwargs)
+
+        def apply_btn_click(b):
+
+            marker_layer = self.find_layer("Search location")
+            if marker_layer is not None:
+                self.remove(marker_layer)
+            self.clean_up()
+
+            if self.user_roi is None:
+                output.clear_output()
+                output.append_stdout("Please draw a ROI first.")
+            elif (
+                pre_start_date.value is None
+                or pre_end_date.value is None
+                or post_start_date.value is None
+                or post_end_date.value is None
+            ):
+                output.clear_output()
+                output.append_stdout("Please select start and end dates.")
+
+            elif self.user_roi is not None:
+                output.clear_output()
+                output.append_stdout("Computing... Please wait.")
+                roi = ee.FeatureCollection(self.user_roi)
+                vis_params = compare.VIS_PARAMS
+                pre_col = compare.build_collection(
+                    roi,
+                    pre_start_date.value,
+                    pre_end_date.value,
+                    pre_cloud_cover.value,
+                )
+                post_col = compare.build_collection(
+                    roi,
+                    post_start_date.value,
+                    post_end_date.value,
+                    post_cloud_cover.value,
+                )
+
+                pre_img = pre_col.median().clip(roi)
+                post_img = post_col.median().clip(roi)
+
+                if use_split.value:
+                    left_layer = tiles.CachedTileLayer(
+                        pre_img, vis_params, "Pre-event Image"
+                    )
+                    right_layer = tiles.CachedTileLayer(
+                        post_img, vis_params, "Post-event Image"
+                    )
+                    self.split_map(
+                        left_layer,
+                        right_layer,
+                        add_close_button=True,
+                        left_label="Pre-event",
+                        right_label="Post-event",
+                    )
+                else:
+                    tiles.add_layer(self, pre_img, vis_params, "Pre-event Image")
+                    tiles.add_layer(self, post_img, vis_params, "Post-event Image")
+
+                if tasks.stale():
+                    return
+
+                if use_ndwi.value and (not use_split.value) and use_combined.value:
+                    # One multi-band image and one tile layer for all water classes.
+                    self.change_image = compare.water_change(
+                        pre_img, post_img, ndwi_threhold.value
+                    )
+                    classes = checked_classes()
+                    image, change_vis = compare.change_layer(
+                        self.change_image, classes or None
+                    )
+                    tiles.add_layer(
+                        self, image, change_vis, "Water Change", bool(classes)
+                    )
+                    self.add(change_legend)
+
+                elif use_ndwi.value and (not use_split.value):
+                    pre_ndwi = pre_img.normalizedDifference(["B3", "B6"]).rename("NDWI")
+                    post_ndwi = post_img.normalizedDifference(["B3", "B6"]).rename(
+                        "NDWI"
+                    )
+                    ndwi_vis = {"min": -1, "max": 1, "palette": "ndwi"}
+                    tiles.add_layer(self, pre_ndwi, ndwi_vis, "Pre-event NDWI", False)
+                    tiles.add_layer(self, post_ndwi, ndwi_vis, "Post-event NDWI", False)
+
+                    pre_water = pre_ndwi.gt(ndwi_threhold.value)
+                    post_water = post_ndwi.gt(ndwi_threhold.value)
+                    tiles.add_layer(
+                        self,
+                        pre_water.selfMask(),
+                        {"palette": "blue"},
+                        "Pre-event Water",
+                    )
+                    tiles.add_layer(
+                        self,
+                        post_water.selfMask(),
+                        {"palette": "red"},
+                        "Post-event Water",
+                    )
+                    new_water = post_water.subtract(pre_water).gt(0)
+                    disappear_water = pre_water.subtract(post_water).gt(0)
+                    tiles.add_layer(
+                        self,
+                        disappear_water.selfMask(),
+                        {"palette": "brown"},
+                        "Disappeared Water",
+                    )
+                    tiles.add_layer(
+                        self, new_water.selfMask(), {"palette": "cyan"}, "New Water"
+                    )
+
+                    with output:
+                        output.clear_output()
+
+                output.clear_output()
+
+        apply_btn.on_click(self.tasks.wrap("compare", apply_btn_click))
+
+        def reset_btn_click(b):
+            self.clean_up()
+            self._draw_control.clear()
+            draw_layer = self.find_layer("Drawn Features")
+            if draw_layer is not None:
+                self.remove(draw_layer)
+            output.clear_output()
+
+        reset_btn.on_click(self.tasks.wrap("compare", reset_btn_click))
+
+        def summarize_btn_click(b):
+            if (
+                pre_start_date.value is None
+                or pre_end_date.value is None
+                or post_start_date.value is None
+                or post_end_date.value is None
+            ):
+                output.clear_output()
+                output.append_stdout("Please select start and end dates.")
+                return
+
+            output.clear_output()
+            output.append_stdout("Starting the export... Please wait.")
+            try:
+                stats = compare.summarize(
+                    (pre_start_date.value, pre_end_date.value),
+                    (post_start_date.value, post_end_date.value),
+                    pre_cloud_cover=pre_cloud_cover.value,
+                    post_cloud_cover=post_cloud_cover.value,
+                    threshold=ndwi_threhold.value,
+                )
+                description = (
+                    f"compare_summary_{pre_start_date.value:%Y%m%d}"
+                    f"_{post_end_date.value:%Y%m%d}"
+                )
+                task = compare.export_summary(stats, description)
+                output.clear_output()
+                output.append_stdout(
+                    f"Started Earth Engine export task {task.id}.\n"
+                    f"{description}.csv will be saved to the "
+                    f"{compare.EXPORT_FOLDER!r} folder of the app's Google Drive."
+                )
+            except Exception as e:
+                output.clear_output()
+                output.append_stdout(f"Error: {e}")
+
+        summarize_btn.on_click(self.tasks.wrap("summarize", summarize_btn_click))
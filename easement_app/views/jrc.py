@@ -0,0 +1,247 @@
+import ee
+import geemap
+import ipywidgets as widgets
+from ipyleaflet import WidgetControl
+from .. import (
+    EASEMENT_ASSET,
+    batch,
+    charts,
+    easements,
+    jrc,
+    sessions,
+    tasks,
+    tileproxy,
+    tiles,
+)
+
+
+class Map(geemap.Map):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = tasks.TaskGroup(page="jrc")
+        sessions.register(self)
+        self.add_basemap("Esri.WorldImagery")
+        tileproxy.proxy_layers(self)
+        self.add_ee_data()
+        self.add_buttons(add_header=True)
+
+    def add_ee_data(self):
+
+        vis_params = jrc.OCCURRENCE_VIS
+        tiles.add_layer(self, jrc.occurrence_image(), vis_params, "Occurrence")
+        self.add_colorbar(
+            vis_params, label="Water occurrence (%)", layer_name="Occurrence"
+        )
+
+        easement = ee.FeatureCollection(EASEMENT_ASSET)
+        tiles.add_layer(
+            self, easement.style(**easements.EASEMENT_STYLE), {}, "Easements"
+        )
+
+        info = widgets.Output()
+        info_ctrl = WidgetControl(widget=info, position="bottomright")
+        self.add(info_ctrl)
+
+        def clear_results():
+            if hasattr(self, "output"):
+                self.output.clear_output()
+                self.chart.clear()
+
+        easements.add_search(self, info, on_select=clear_results)
+
+        def handle_click(latlon):
+            clear_results()
+            selected_layer = self.find_layer("Selected")
+            if selected_layer is not None:
+                self.remove_layer(selected_layer)
+            self.default_style = {"cursor": "wait"}
+            index = easements.get_index()
+            if index is not None:
+                i = index.locate(*latlon[::-1])
+                if i is not None:
+                    easements.select(self, index, i, info, zoom=False)
+            else:
+                clicked_point = ee.Geometry.Point(latlon[::-1])
+                selected = easement.filterBounds(clicked_point)
+                result = batch.evaluate(
+                    size=selected.size(),
+                    info=selected.limit(1)
+                    .toList(1)
+                    .map(lambda f: ee.Feature(f).toDictionary()),
+                )
+                if tasks.stale():
+                    return
+                if result["size"] > 0:
+
+                    selected_style = {
+                        "color": "ffff00",
+                        "width": 2,
+                        "fillColor": "00000020",
+                    }
+                    tiles.add_layer(
+                        self, selected.style(**selected_style), {}, "Selected"
+                    )
+                    easements.set_selected(
+                        self, result["info"][0], selected.geometry(), info
+                    )
+
+            self.default_style = {"cursor": "default"}
+
+        def handle_interaction(**kwargs):
+            if kwargs.get("type") == "click":
+                self.tasks.submit("click", handle_click, kwargs.get("coordinates"))
+
+        self.on_interaction(handle_interaction)
+
+    def add_buttons(self, position="topright", **kwargs):
+        padding = "0px 5px 0px 5px"
+        widget = widgets.VBox(layout=widgets.Layout(padding=padding))
+        layout = widgets.Layout(width="auto")
+        style = {"description_width": "initial"}
+        hist_btn = widgets.Button(description="Occurrence", layout=layout)
+        bar_btn = widgets.Button(description="Monthly history", layout=layout)
+        reset_btn = widgets.Button(description="Reset", layout=layout)
+        scale = widgets.IntSlider(
+            min=30, max=1000, value=30, description="Scale", layout=layout, style=style
+        )
+        preview = widgets.Checkbox(
+            value=True,
+            description="Preview",
+            tooltip="Show a quick coarse preview of large ROIs before the chosen scale",
+            indent=False,
+            layout=widgets.Layout(width="70px"),
+        )
+        month_slider = widgets.IntRangeSlider(
+            description="Months",
+            value=[5, 10],
+            min=1,
+            max=12,
+            step=1,
+            layout=layout,
+            style=style,
+        )
+        widget.children = [
+            widgets.HBox([hist_btn, bar_btn, reset_btn]),
+            month_slider,
+            widgets.HBox([scale, preview]),
+        ]
+        self.add_widget(widget, position=position, **kwargs)
+        output = widgets.Output()
+        chart = charts.BarChart()
+        self.add_widget(
+            widgets.VBox([output, chart.widget]),
+            position="bottomleft",
+            add_header=False,
+        )
+        setattr(self, "output", output)
+        setattr(self, "chart", chart)
+
+        def progressive(region, compute, plot, cached=None):
+            # With preview on, show a coarse result for large ROIs first, then
+            # the result at the requested scale. cached(region, scale) tells
+            # whether the requested scale is already available locally.
+            fine = scale.value
+            if preview.value and not (cached is not None and cached(region, fine)):
+                coarse = jrc.auto_scale(jrc.roi_area(region), jrc.PREVIEW_PIXELS, fine)
+                if coarse > fine:
+                    result = compute(region, coarse)
+                    if tasks.stale():
+                        return
+                    plot(result, f"Preview at {coarse} m, refining at {fine} m...")
+
+            result = compute(region, fine)
+            if tasks.stale():
+                return
+            plot(result)
+
+        def compute_hist(region, scale_value):
+            return geemap.image_histogram(
+                jrc.occurrence_image(),
+                region,
+                scale=scale_value,
+                height=350,
+                width=550,
+                x_label="Water Occurrence (%)",
+                y_label="Pixel Count",
+                layout_args={
+                    "title": dict(x=0.5),
+                    "margin": dict(l=0, r=0, t=10, b=0),
+                },
+                return_df=True,
+            )
+
+        def plot_hist(hist, note=None):
+            output.clear_output()
+            chart.update(
+                hist["key"],
+                hist["value"],
+                x_label="Water Occurrence (%)",
+                y_label="Pixel Count",
+                tick_step=3,
+            )
+            if note is not None:
+                output.append_stdout(note)
+
+        def hist_btn_click(b):
+            region = self.user_roi
+            if region is not None:
+                output.clear_output()
+                output.append_stdout("Computing histogram...")
+                hist = None
+                objectid = easements.selected_objectid(self)
+                if objectid is not None:
+                    hist = jrc.cached_histogram(objectid, scale.value)
+                self.default_style = {"cursor": "wait"}
+                if hist is not None:
+                    plot_hist(hist)
+                else:
+                    progressive(region, compute_hist, plot_hist)
+                self.default_style = {"cursor": "default"}
+            else:
+                output.clear_output()
+                chart.clear()
+                with output:
+                    output.append_stdout("Please draw a region of interest first.")
+
+        hist_btn.on_click(self.tasks.wrap("chart", hist_btn_click))
+
+        def compute_bar(region, scale_value):
+            history = jrc.monthly_history(region, scale_value)
+            return jrc.filter_months(
+                history, month_slider.value[0], month_slider.value[1]
+            )
+
+        def plot_bar(bar, note=None):
+            output.clear_output()
+            chart.update(
+                bar["Month"],
+                bar["Area"],
+                x_label="Month",
+                y_label="Area (ha)",
+                tick_step=5,
+            )
+            if note is not None:
+                output.append_stdout(note)
+
+        def bar_btn_click(b):
+            region = self.user_roi
+            if region is not None:
+                self.default_style = {"cursor": "wait"}
+                output.clear_output()
+                output.append_stdout("Computing monthly history...")
+                progressive(region, compute_bar, plot_bar, jrc.history_cached)
+                self.default_style = {"cursor": "default"}
+            else:
+                output.clear_output()
+                chart.clear()
+                with output:
+                    output.append_stdout("Please draw a region of interest first.")
+
+        bar_btn.on_click(self.tasks.wrap("chart", bar_btn_click))
+
+        def reset_btn_click(b):
+            self._draw_control.clear()
+            output.clear_output()
+            chart.clear()
+
+        reset_btn.on_click(self.tasks.wrap("chart", reset_btn_click))
@@ -0,0 +1,157 @@
+import ee
+import geemap
+import ipywidgets as widgets
+from ipyleaflet import WidgetControl
+from .. import (
+    EASEMENT_ASSET,
+    batch,
+    easements,
+    sessions,
+    sliders,
+    tasks,
+    tileproxy,
+    tiles,
+    timeseries,
+)
+
+
+class Map(geemap.Map):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = tasks.TaskGroup(page="naip")
+        sessions.register(self)
+        self.add_basemap("Esri.WorldImagery", True)
+        tileproxy.proxy_layers(self)
+        easement = ee.FeatureCollection(EASEMENT_ASSET)
+        tiles.add_layer(
+            self, easement.style(**easements.EASEMENT_STYLE), {}, "Easements"
+        )
+
+        info = widgets.Output()
+        info_ctrl = WidgetControl(widget=info, position="bottomright")
+        self.add(info_ctrl)
+        easements.add_search(self, info)
+
+        def handle_click(latlon):
+            selected_layer = self.find_layer("Selected")
+            if selected_layer is not None:
+                self.remove_layer(selected_layer)
+            self.default_style = {"cursor": "wait"}
+            index = easements.get_index()
+            if index is not None:
+                i = index.locate(*latlon[::-1])
+                if i is not None:
+                    easements.select(self, index, i, info, zoom=False)
+            else:
+                clicked_point = ee.Geometry.Point(latlon[::-1])
+                selected = easement.filterBounds(clicked_point)
+                result = batch.evaluate(
+                    size=selected.size(),
+                    info=selected.limit(1)
+                    .toList(1)
+                    .map(lambda f: ee.Feature(f).toDictionary()),
+                )
+                if tasks.stale():
+                    return
+                if result["size"] > 0:
+
+                    selected_style = {
+                        "color": "ffff00",
+                        "width": 2,
+                        "fillColor": "00000020",
+                    }
+                    tiles.add_layer(
+                        self, selected.style(**selected_style), {}, "Selected"
+                    )
+                    easements.set_selected(
+                        self, result["info"][0], selected.geometry(), info
+                    )
+
+            self.default_style = {"cursor": "default"}
+
+        def handle_interaction(**kwargs):
+            if kwargs.get("type") == "click":
+                self.tasks.submit("click", handle_click, kwargs.get("coordinates"))
+
+        self.on_interaction(handle_interaction)
+
+        # Collapses the layer list; newer geemap toolbars no longer have it.
+        if hasattr(self._toolbar, "toggle_layers"):
+            self._toolbar.toggle_layers(False)
+        self.add_gui()
+
+    def add_gui(self):
+        widget_width = "350px"
+        padding = "0px 0px 0px 5px"  # upper, right, bottom, left
+        style = {"description_width": "initial"}
+        button_width = "113px"
+
+        text = widgets.Text(
+            "Draw a rectangle on the map",
+            layout=widgets.Layout(padding="0px", width="230px"),
+        )
+
+        bands = widgets.Dropdown(
+            description="Bands:",
+            options=[
+                "Red/Green/Blue",
+                "NIR/Red/Green",
+            ],
+            value="NIR/Red/Green",
+            layout=widgets.Layout(width="230px", padding=padding),
+            style=style,
+        )
+
+        apply_btn = widgets.Button(
+            description="Time slider",
+            button_style="primary",
+            tooltip="Click to create timeseries",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+
+        split_btn = widgets.Button(
+            description="Split map",
+            button_style="primary",
+            tooltip="Click to create timeseries",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+        widget = widgets.VBox([text, bands, widgets.HBox([apply_btn, split_btn])])
+        widget.layout.padding = "0px 4px 0px 4px"
+        self.add(WidgetControl(widget=widget, position="topright"))
+
+        def apply_btn_click(b):
+            if self.user_roi is not None:
+
+                if bands.value == "NIR/Red/Green":
+                    RGBN = True
+                    vis_params = {"bands": ["N", "R", "G"], "min": 0, "max": 255}
+                else:
+                    RGBN = False
+                    vis_params = {"bands": ["R", "G", "B"], "min": 0, "max": 255}
+                series = timeseries.naip_timeseries(self.user_roi, RGBN=RGBN)
+                dates = series.dates("YYYY")
+                if tasks.stale():
+                    return
+                sliders.add_ee_time_slider(self, series.collection, dates, vis_params)
+
+        apply_btn.on_click(self.tasks.wrap("timeseries", apply_btn_click))
+
+        def split_btn_click(b):
+            if self.user_roi is not None:
+                if bands.value == "NIR/Red/Green":
+                    RGBN = True
+                    vis_params = {"bands": ["N", "R", "G"], "min": 0, "max": 255}
+                else:
+                    RGBN = False
+                    vis_params = {"bands": ["R", "G", "B"], "min": 0, "max": 255}
+                series = timeseries.naip_timeseries(self.user_roi, RGBN=RGBN)
+                dates = series.dates("YYYY")
+                if tasks.stale():
+                    return
+                sliders.add_ee_split_inspector(
+                    self, series.collection, dates, vis_params, width="100px"
+                )
+
+        split_btn.on_click(self.tasks.wrap("timeseries", split_btn_click))
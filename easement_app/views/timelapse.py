@@ -0,0 +1,429 @@
+import base64
+import os
+import ee
+import geemap
+import ipywidgets as widgets
+from IPython.display import display
+from geemap import get_current_year, jslink_slider_label
+from ipyleaflet import VideoOverlay, WidgetControl
+from .. import (
+    EASEMENT_ASSET,
+    batch,
+    easements,
+    sessions,
+    tasks,
+    tileproxy,
+    tiles,
+    timelapse,
+)
+
+
+class Map(geemap.Map):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = tasks.TaskGroup(page="timelapse")
+        sessions.register(self)
+        self.add_basemap("Esri.WorldImagery")
+        tileproxy.proxy_layers(self)
+        easement = ee.FeatureCollection(EASEMENT_ASSET)
+        tiles.add_layer(
+            self, easement.style(**easements.EASEMENT_STYLE), {}, "Easements"
+        )
+        self.add_timelapse_gui(position="topright")
+
+        info = widgets.Output()
+        info_ctrl = WidgetControl(widget=info, position="bottomright")
+        self.add(info_ctrl)
+
+        def remove_timelapse():
+            timelapse_layer = self.find_layer("Timelapse")
+            if timelapse_layer is not None:
+                self.remove_layer(timelapse_layer)
+
+        easements.add_search(self, info, on_select=remove_timelapse)
+
+        def handle_click(latlon):
+            selected_layer = self.find_layer("Selected")
+            if selected_layer is not None:
+                self.remove_layer(selected_layer)
+            remove_timelapse()
+            self.default_style = {"cursor": "wait"}
+            index = easements.get_index()
+            if index is not None:
+                i = index.locate(*latlon[::-1])
+                if i is not None:
+                    easements.select(self, index, i, info, zoom=False)
+            else:
+                clicked_point = ee.Geometry.Point(latlon[::-1])
+                selected = easement.filterBounds(clicked_point)
+                result = batch.evaluate(
+                    size=selected.size(),
+                    info=selected.limit(1)
+                    .toList(1)
+                    .map(lambda f: ee.Feature(f).toDictionary()),
+                )
+                if tasks.stale():
+                    return
+                if result["size"] > 0:
+
+                    selected_style = {
+                        "color": "ffff00",
+                        "width": 2,
+                        "fillColor": "00000020",
+                    }
+                    tiles.add_layer(
+                        self, selected.style(**selected_style), {}, "Selected"
+                    )
+                    easements.set_selected(
+                        self, result["info"][0], selected.geometry(), info
+                    )
+
+            self.default_style = {"cursor": "default"}
+
+        def handle_interaction(**kwargs):
+            if kwargs.get("type") == "click":
+                self.tasks.submit("click", handle_click, kwargs.get("coordinates"))
+
+        self.on_interaction(handle_interaction)
+
+    def add_timelapse_gui(self, position="topright"):
+
+        widget_width = "350px"
+        padding = "0px 0px 0px 5px"  # upper, right, bottom, left
+        style = {"description_width": "initial"}
+        current_year = get_current_year()
+
+        collection = widgets.Dropdown(
+            options=[
+                "Landsat TM-ETM-OLI Surface Reflectance",
+            ],
+            value="Landsat TM-ETM-OLI Surface Reflectance",
+            description="Collection:",
+            layout=widgets.Layout(width=widget_width, padding=padding),
+            style=style,
+        )
+
+        title = widgets.Text(
+            value="Timelapse",
+            description="Title:",
+            style=style,
+            layout=widgets.Layout(width="181px", padding=padding),
+        )
+
+        bands = widgets.Dropdown(
+            description="RGB:",
+            options=[
+                "Red/Green/Blue",
+                "NIR/Red/Green",
+                "SWIR2/SWIR1/NIR",
+                "NIR/SWIR1/Red",
+                "SWIR2/NIR/Red",
+                "SWIR2/SWIR1/Red",
+                "SWIR1/NIR/Blue",
+                "NIR/SWIR1/Blue",
+                "SWIR2/NIR/Green",
+                "SWIR1/NIR/Red",
+            ],
+            value="SWIR1/NIR/Red",
+            style=style,
+            layout=widgets.Layout(width="165px", padding=padding),
+        )
+
+        speed = widgets.IntSlider(
+            description="Frames/sec:",
+            tooltip="Frames per second",
+            value=10,
+            min=1,
+            max=30,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="142px", padding=padding),
+        )
+
+        speed_label = widgets.Label(
+            "10",
+            layout=widgets.Layout(width="20px", padding=padding),
+        )
+        jslink_slider_label(speed, speed_label)
+
+        video_format = widgets.Dropdown(
+            description="Format:",
+            options=[("MP4", "mp4"), ("WebM", "webm")],
+            value="mp4",
+            style=style,
+            layout=widgets.Layout(width="180px", padding=padding),
+        )
+
+        cloud = widgets.Checkbox(
+            value=True,
+            description="Apply fmask (remove clouds, shadows, snow)",
+            tooltip="Apply fmask (remove clouds, shadows, snow)",
+            style=style,
+        )
+
+        start_year = widgets.IntSlider(
+            description="Start Year:",
+            value=1984,
+            min=1984,
+            max=current_year,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="138px", padding=padding),
+        )
+
+        start_year_label = widgets.Label("1984")
+        jslink_slider_label(start_year, start_year_label)
+
+        end_year = widgets.IntSlider(
+            description="End Year:",
+            value=current_year,
+            min=1984,
+            max=current_year,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="138px", padding=padding),
+        )
+        end_year_label = widgets.Label(str(current_year))
+        jslink_slider_label(end_year, end_year_label)
+
+        start_month = widgets.IntSlider(
+            description="Start Month:",
+            value=5,
+            min=1,
+            max=12,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="145px", padding=padding),
+        )
+
+        start_month_label = widgets.Label(
+            "5",
+            layout=widgets.Layout(width="20px", padding=padding),
+        )
+        jslink_slider_label(start_month, start_month_label)
+
+        end_month = widgets.IntSlider(
+            description="End Month:",
+            value=10,
+            min=1,
+            max=12,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="155px", padding=padding),
+        )
+
+        end_month_label = widgets.Label("10")
+        jslink_slider_label(end_month, end_month_label)
+
+        font_size = widgets.IntSlider(
+            description="Font size:",
+            value=30,
+            min=10,
+            max=50,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="152px", padding=padding),
+        )
+
+        font_size_label = widgets.Label("30")
+        jslink_slider_label(font_size, font_size_label)
+
+        font_color = widgets.ColorPicker(
+            concise=False,
+            description="Font color:",
+            value="white",
+            style=style,
+            layout=widgets.Layout(width="170px", padding=padding),
+        )
+
+        progress_bar_color = widgets.ColorPicker(
+            concise=False,
+            description="Progress bar:",
+            value="blue",
+            style=style,
+            layout=widgets.Layout(width="180px", padding=padding),
+        )
+
+        nd_indices = widgets.Dropdown(
+            options={
+                "Vegetation Index (NDVI)": ("NIR", "Red"),
+                "Water Index (NDWI)": ("Green", "NIR"),
+                "Modified Water Index (MNDWI)": ("Green", "SWIR1"),
+                "Snow Index (NDSI)": ("Green", "SWIR1"),
+                "Soil Index (NDSI)": ("SWIR1", "NIR"),
+                "Burn Ratio (NBR)": ("NIR", "SWIR2"),
+                "Customized": (None, None),
+            },
+            value=None,
+            description="Normalized Difference Index:",
+            style=style,
+            layout=widgets.Layout(width="347px", padding=padding),
+        )
+
+        first_band = widgets.Dropdown(
+            description="1st band:",
+            options=["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"],
+            value=None,
+            style=style,
+            layout=widgets.Layout(width="171px", padding=padding),
+        )
+
+        second_band = widgets.Dropdown(
+            description="2nd band:",
+            options=["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"],
+            value=None,
+            style=style,
+            layout=widgets.Layout(width="172px", padding=padding),
+        )
+
+        nd_threshold = widgets.FloatSlider(
+            value=0,
+            min=-1,
+            max=1,
+            step=0.01,
+            description="Threshold:",
+            orientation="horizontal",
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="159px", padding=padding),
+        )
+
+        nd_threshold_label = widgets.Label(
+            "0",
+            layout=widgets.Layout(width="35px", padding=padding),
+        )
+        jslink_slider_label(nd_threshold, nd_threshold_label)
+
+        nd_color = widgets.ColorPicker(
+            concise=False,
+            description="Color:",
+            value="blue",
+            style=style,
+            layout=widgets.Layout(width="145px", padding=padding),
+        )
+
+        def nd_index_change(change):
+            if change["new"] is not None:
+                first_band.value, second_band.value = change["new"]
+
+        nd_indices.observe(nd_index_change, names="value")
+
+        output = widgets.Output(
+            layout=widgets.Layout(width=widget_width, padding=padding)
+        )
+
+        button_width = "113px"
+        create_btn = widgets.Button(
+            description="Create timelapse",
+            button_style="primary",
+            tooltip="Click to create timelapse",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+
+        reset_btn = widgets.Button(
+            description="Reset",
+            button_style="primary",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+
+        vbox = widgets.VBox(
+            [
+                collection,
+                widgets.HBox([title, bands]),
+                widgets.HBox([speed, speed_label, video_format]),
+                widgets.HBox([start_year, start_year_label, end_year, end_year_label]),
+                widgets.HBox(
+                    [start_month, start_month_label, end_month, end_month_label]
+                ),
+                widgets.HBox([font_size, font_size_label, font_color]),
+                progress_bar_color,
+                cloud,
+                nd_indices,
+                widgets.HBox([first_band, second_band]),
+                widgets.HBox([nd_threshold, nd_threshold_label, nd_color]),
+                widgets.HBox([create_btn, reset_btn]),
+                output,
+            ]
+        )
+        self.add_widget(vbox, position=position, add_header=True)
+
+        def create_btn_click(change):
+            output.clear_output()
+            if self.user_roi is None:
+                output.append_stdout("Please draw a ROI first.")
+                return
+            if start_year.value > end_year.value:
+                output.append_stdout("The end year must be after the start year.")
+                return
+            if start_month.value > end_month.value:
+                output.append_stdout("The end month must be after the start month.")
+                return
+
+            nd_bands = None
+            if first_band.value is not None and second_band.value is not None:
+                nd_bands = [first_band.value, second_band.value]
+
+            def progress(done, total):
+                output.outputs = (
+                    {
+                        "name": "stdout",
+                        "output_type": "stream",
+                        "text": f"Rendering frame {done}/{total}...",
+                    },
+                )
+
+            output.append_stdout("Computing... Please wait...")
+            roi = self.user_roi
+            path = timelapse.cached_render(
+                roi,
+                start_year.value,
+                end_year.value,
+                str(start_month.value).zfill(2) + "-01",
+                str(end_month.value).zfill(2) + "-30",
+                bands.value.split("/"),
+                format=video_format.value,
+                title=title.value,
+                fps=speed.value,
+                apply_fmask=cloud.value,
+                nd_bands=nd_bands,
+                nd_threshold=nd_threshold.value,
+                nd_color=nd_color.value,
+                font_size=font_size.value,
+                font_color=font_color.value,
+                progress_bar_color=progress_bar_color.value,
+                progress=progress,
+                cancelled=tasks.stale,
+            )
+            if path is None or tasks.stale():
+                return
+            bounds = timelapse.bounds(roi)
+            with open(path, "rb") as f:
+                data = base64.b64encode(f.read()).decode()
+
+            layer = self.find_layer("Timelapse")
+            if layer is not None:
+                self.remove(layer)
+            self.add(
+                VideoOverlay(
+                    url=f"data:video/{video_format.value};base64,{data}",
+                    bounds=bounds,
+                    name="Timelapse",
+                )
+            )
+            output.clear_output()
+            with output:
+                display(
+                    geemap.create_download_link(path, title="Click here to download: ")
+                )
+
+        create_btn.on_click(self.tasks.wrap("timelapse", create_btn_click))
+
+        def reset_btn_click(change):
+            output.clear_output()
+            layer = self.find_layer("Timelapse")
+            if layer is not None:
+                self.remove(layer)
+
+        reset_btn.on_click(self.tasks.wrap("timelapse", reset_btn_click))
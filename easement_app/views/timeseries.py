@@ -0,0 +1,355 @@
+import ee
+import geemap
+import ipywidgets as widgets
+from geemap import get_current_year, jslink_slider_label
+from ipyleaflet import WidgetControl
+from .. import (
+    EASEMENT_ASSET,
+    batch,
+    composites,
+    easements,
+    sessions,
+    sliders,
+    tasks,
+    tileproxy,
+    tiles,
+    timeseries,
+)
+
+
+class Map(geemap.Map):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = tasks.TaskGroup(page="timeseries")
+        sessions.register(self)
+        self.add_basemap("Esri.WorldImagery")
+        tileproxy.proxy_layers(self)
+        easement = ee.FeatureCollection(EASEMENT_ASSET)
+        tiles.add_layer(
+            self, easement.style(**easements.EASEMENT_STYLE), {}, "Easements"
+        )
+
+        info = widgets.Output()
+        info_ctrl = WidgetControl(widget=info, position="bottomright")
+        self.add(info_ctrl)
+        easements.add_search(self, info)
+
+        def handle_click(latlon):
+            selected_layer = self.find_layer("Selected")
+            if selected_layer is not None:
+                self.remove_layer(selected_layer)
+            self.default_style = {"cursor": "wait"}
+            index = easements.get_index()
+            if index is not None:
+                i = index.locate(*latlon[::-1])
+                if i is not None:
+                    easements.select(self, index, i, info, zoom=False)
+            else:
+                clicked_point = ee.Geometry.Point(latlon[::-1])
+                selected = easement.filterBounds(clicked_point)
+                result = batch.evaluate(
+                    size=selected.size(),
+                    info=selected.limit(1)
+                    .toList(1)
+                    .map(lambda f: ee.Feature(f).toDictionary()),
+                )
+                if tasks.stale():
+                    return
+                if result["size"] > 0:
+
+                    selected_style = {
+                        "color": "ffff00",
+                        "width": 2,
+                        "fillColor": "00000020",
+                    }
+                    tiles.add_layer(
+                        self, selected.style(**selected_style), {}, "Selected"
+                    )
+                    easements.set_selected(
+                        self, result["info"][0], selected.geometry(), info
+                    )
+
+            self.default_style = {"cursor": "default"}
+
+        def handle_interaction(**kwargs):
+            if kwargs.get("type") == "click":
+                self.tasks.submit("click", handle_click, kwargs.get("coordinates"))
+
+        self.on_interaction(handle_interaction)
+
+        self.add_ts_gui(position="topright")
+
+    def clean_up(self):
+        sliders.remove_time_slider(self)
+
+        layer = self.find_layer("Image X")
+        if layer is not None:
+            self.remove(layer)
+
+        draw_layer = self.find_layer("Drawn Features")
+        if draw_layer is not None:
+            self.remove(draw_layer)
+
+        selected_layer = self.find_layer("Selected")
+        if selected_layer is not None:
+            self.remove_layer(selected_layer)
+
+    def add_ts_gui(self, position="topright", **kwargs):
+
+        widget_width = "350px"
+        padding = "0px 0px 0px 5px"  # upper, right, bottom, left
+        style = {"description_width": "initial"}
+        current_year = get_current_year()
+
+        collection = widgets.Dropdown(
+            options=[
+                "Landsat TM-ETM-OLI Surface Reflectance",
+            ],
+            value="Landsat TM-ETM-OLI Surface Reflectance",
+            description="Collection:",
+            layout=widgets.Layout(width=widget_width, padding=padding),
+            style=style,
+        )
+        bands = widgets.Dropdown(
+            description="Bands:",
+            options=[
+                "Red/Green/Blue",
+                "NIR/Red/Green",
+                "SWIR2/SWIR1/NIR",
+                "NIR/SWIR1/Red",
+                "SWIR2/NIR/Red",
+                "SWIR2/SWIR1/Red",
+                "SWIR1/NIR/Blue",
+                "NIR/SWIR1/Blue",
+                "SWIR2/NIR/Green",
+                "SWIR1/NIR/Red",
+            ],
+            value="SWIR1/NIR/Red",
+            style=style,
+            layout=widgets.Layout(width="195px", padding=padding),
+        )
+
+        frequency = widgets.Dropdown(
+            description="Frequency:",
+            options=["year", "quarter", "month"],
+            value="year",
+            style=style,
+            layout=widgets.Layout(width="150px", padding=padding),
+        )
+
+        start_year = widgets.IntSlider(
+            description="Start Year:",
+            value=1984,
+            min=1984,
+            max=current_year,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="138px", padding=padding),
+        )
+
+        start_year_label = widgets.Label("1984")
+        jslink_slider_label(start_year, start_year_label)
+
+        end_year = widgets.IntSlider(
+            description="End Year:",
+            value=current_year,
+            min=1984,
+            max=current_year,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="138px", padding=padding),
+        )
+        end_year_label = widgets.Label(str(current_year))
+        jslink_slider_label(end_year, end_year_label)
+
+        start_month = widgets.IntSlider(
+            description="Start Month:",
+            value=5,
+            min=1,
+            max=12,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="145px", padding=padding),
+        )
+
+        start_month_label = widgets.Label(
+            "5",
+            layout=widgets.Layout(width="20px", padding=padding),
+        )
+        jslink_slider_label(start_month, start_month_label)
+
+        end_month = widgets.IntSlider(
+            description="End Month:",
+            value=10,
+            min=1,
+            max=12,
+            readout=False,
+            style=style,
+            layout=widgets.Layout(width="155px", padding=padding),
+        )
+
+        end_month_label = widgets.Label("10")
+        jslink_slider_label(end_month, end_month_label)
+
+        output = widgets.Output()
+
+        button_width = "113px"
+        apply_btn = widgets.Button(
+            description="Time slider",
+            button_style="primary",
+            tooltip="Click to create timeseries",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+
+        split_btn = widgets.Button(
+            description="Split map",
+            button_style="primary",
+            tooltip="Click to create timeseries",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+
+        reset_btn = widgets.Button(
+            description="Reset",
+            button_style="primary",
+            style=style,
+            layout=widgets.Layout(padding="0px", width=button_width),
+        )
+
+        vbox = widgets.VBox(
+            [
+                collection,
+                widgets.HBox([bands, frequency]),
+                widgets.HBox([start_year, start_year_label, end_year, end_year_label]),
+                widgets.HBox(
+                    [start_month, start_month_label, end_month, end_month_label]
+                ),
+                widgets.HBox([apply_btn, split_btn, reset_btn]),
+                output,
+            ]
+        )
+        self.add_widget(vbox, position=position, add_header=True)
+
+        def apply_btn_click(change):
+
+            sliders.remove_time_slider(self)
+
+            with output:
+                output.clear_output()
+                if self.user_roi is None:
+                    output.append_stdout("Please draw a ROI first.")
+                else:
+                    output.append_stdout("Creating time series...")
+                    start_date = str(start_month.value).zfill(2) + "-01"
+                    end_date = str(end_month.value).zfill(2) + "-01"
+
+                    # Use the precomputed composites of a clicked easement if any.
+                    frames = None
+                    objectid = easements.selected_objectid(self)
+                    if objectid is not None and frequency.value == "year":
+                        frames = composites.cached_frames(
+                            objectid,
+                            start_year.value,
+                            end_year.value,
+                            window=(start_date, end_date),
+                        )
+
+                    if frames:
+                        sliders.add_cog_time_slider(
+                            self, frames, bands.value.split("/"), vmin=0, vmax=0.4
+                        )
+                    else:
+                        series = timeseries.landsat_timeseries(
+                            roi=self.user_roi,
+                            start_year=start_year.value,
+                            end_year=end_year.value,
+                            start_date=start_date,
+                            end_date=end_date,
+                            frequency=frequency.value,
+                        )
+                        collection = series.collection
+                        vis_params = {
+                            "bands": bands.value.split("/"),
+                            "min": 0,
+                            "max": 0.4,
+                        }
+
+                        if frequency.value == "year":
+                            date_format = "YYYY"
+                        elif frequency.value == "quarter":
+                            date_format = "YYYY-MM"
+                        elif frequency.value == "month":
+                            date_format = "YYYY-MM"
+                        dates = series.dates(date_format)
+
+                        if tasks.stale():
+                            return
+                        sliders.add_ee_time_slider(
+                            self,
+                            collection,
+                            dates,
+                            vis_params,
+                            region=self.user_roi,
+                        )
+                    self._draw_control.clear()
+                    draw_layer = self.find_layer("Drawn Features")
+                    if draw_layer is not None:
+                        self.remove(draw_layer)
+                    output.clear_output()
+
+        apply_btn.on_click(self.tasks.wrap("timeseries", apply_btn_click))
+
+        def split_btn_click(change):
+
+            sliders.remove_time_slider(self)
+
+            with output:
+                output.clear_output()
+                if self.user_roi is None:
+                    output.append_stdout("Please draw a ROI first.")
+                else:
+                    output.append_stdout("Creating time series...")
+                    series = timeseries.landsat_timeseries(
+                        roi=self.user_roi,
+                        start_year=start_year.value,
+                        end_year=end_year.value,
+                        start_date=str(start_month.value).zfill(2) + "-01",
+                        end_date=str(end_month.value).zfill(2) + "-01",
+                        frequency=frequency.value,
+                    )
+                    collection = series.collection
+                    vis_params = {
+                        "bands": bands.value.split("/"),
+                        "min": 0,
+                        "max": 0.4,
+                    }
+
+                    if frequency.value == "year":
+                        date_format = "YYYY"
+                    elif frequency.value == "quarter":
+                        date_format = "YYYY-MM"
+                    elif frequency.value == "month":
+                        date_format = "YYYY-MM"
+                    dates = series.dates(date_format)
+
+                    if tasks.stale():
+                        return
+                    sliders.add_ee_split_inspector(self, collection, dates, vis_params)
+                    output.clear_output()
+
+                    try:
+                        self._draw_control.clear()
+                        draw_layer = self.find_layer("Drawn Features")
+                        if draw_layer is not None:
+                            self.remove(draw_layer)
+                    except Exception as e:
+                        print(e)
+
+        split_btn.on_click(self.tasks.wrap("timeseries", split_btn_click))
+
+        def reset_btn_click(change):
+            output.clear_output()
+            self.clean_up()
+
+        reset_btn.on_click(self.tasks.wrap("timeseries", reset_btn_click))
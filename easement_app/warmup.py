@@ -0,0 +1,86 @@
+"""Process-wide warm-up, so the first map of every session builds quickly.
+
+Building a page map used to pay for initializing Earth Engine, loading the
+easement index and a getMapId per static layer. start() runs all of that once
+in a background thread when the server loads the pages, and keeps the tile
+URLs of the static layers (the easement outlines and the JRC occurrence)
+refreshed before they expire. The page modules themselves are still imported
+on the first visit of their route.
+
+The static layers are built from easements.EASEMENT_STYLE and
+jrc.OCCURRENCE_VIS, the same constants the pages use, so the warmed URLs are
+the ones the pages look up.
+
+Set EASEMENT_APP_WARMUP=0 to turn it off.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from . import EASEMENT_ASSET
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("EASEMENT_APP_WARMUP", "1") != "0"
+
+_thread = None
+_lock = threading.Lock()
+
+
+def static_layers():
+    """Returns (ee_object, vis_params) of the layers every map page adds."""
+    import ee
+
+    from . import easements, jrc
+
+    easement = ee.FeatureCollection(EASEMENT_ASSET)
+    return [
+        (easement.style(**easements.EASEMENT_STYLE), {}),
+        (jrc.occurrence_image(), jrc.OCCURRENCE_VIS),
+    ]
+
+
+def warm(refresh=False):
+    """Initializes Earth Engine, loads the easement index and fetches the static
+    tile URLs. Returns the seconds it took."""
+    import geemap
+
+    from . import easements, scheduler, tiles
+
+    start = time.perf_counter()
+    geemap.ee_initialize()
+    scheduler.install()
+    easements.get_index()
+    with scheduler.priority(scheduler.BACKGROUND):
+        for ee_object, vis_params in static_layers():
+            tiles.get_tile_url(ee_object, vis_params, refresh=refresh)
+    return time.perf_counter() - start
+
+
+def _run():
+    from . import tiles
+
+    refresh = False
+    while True:
+        try:
+            seconds = warm(refresh)
+            logger.info("Warm-up done in %.1fs", seconds)
+        except Exception:
+            logger.exception("Warm-up failed")
+        time.sleep(max(tiles.TILE_URL_TTL * 0.9, 60))
+        refresh = True
+
+
+def start():
+    """Starts the warm-up thread once per process."""
+    global _thread
+    if not ENABLED:
+        return
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(
+                target=_run, name="easement-app-warmup", daemon=True
+            )
+            _thread.start()
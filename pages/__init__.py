@@ -0,0 +1,4 @@
+# Solara runs this when it loads the pages at startup.
+from easement_app import warmup
+
+warmup.start()
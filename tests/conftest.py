@@ -0,0 +1,53 @@
+"""Runs the tests against benchmarks/fake_ee.py instead of Earth Engine.
+
+The fake must be installed, and the app cache pointed at a scratch
+directory, before anything imports ``ee`` or ``easement_app``.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, ROOT)
+os.environ["EASEMENT_APP_CACHE"] = tempfile.mkdtemp(prefix="easement-app-tests-")
+os.environ["EASEMENT_APP_WARMUP"] = "0"
+
+import fake_ee  # noqa: E402
+
+fake_ee.install()
+
+
+@pytest.fixture
+def recorder():
+    fake_ee.recorder.reset()
+    return fake_ee.recorder
+
+
+@pytest.fixture
+def index():
+    """An EasementIndex with the one easement the fake ee module describes."""
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    from easement_app.easements import EasementIndex
+
+    properties = {k: [v] for k, v in fake_ee.EASEMENT_PROPERTIES.items()}
+    gdf = gpd.GeoDataFrame(
+        properties, geometry=[box(-101.0, 40.0, -100.0, 41.0)], crs="EPSG:4326"
+    )
+    return EasementIndex(gdf)
+
+
+@pytest.fixture
+def index_file(index):
+    """Writes the index to the snapshot path the pages read."""
+    from easement_app import easements
+
+    os.makedirs(os.path.dirname(easements.INDEX_PATH), exist_ok=True)
+    index.gdf.to_parquet(easements.INDEX_PATH)
+    yield easements.INDEX_PATH
+    os.remove(easements.INDEX_PATH)
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pandas as pd
+
+from easement_app import compare
+
+
+def summary():
+    return compare.summarize(
+        (date(2014, 1, 1), date(2014, 12, 31)),
+        (date(2024, 1, 1), date(2024, 12, 31)),
+    )
+
+
+def test_write_summary_parquet(tmp_path, recorder):
+    path = str(tmp_path / "summary.parquet")
+
+    df = compare.write_summary(summary(), path)
+
+    # summarize() is lazy; the whole table comes from one computeFeatures call.
+    assert recorder.calls == ["computeFeatures"]
+    assert list(df.columns) == compare.SUMMARY_COLUMNS
+    assert df["OBJECTID"].tolist() == ["1"]
+    pd.testing.assert_frame_equal(pd.read_parquet(path), df)
+
+
+def test_write_summary_csv_fills_missing_areas(tmp_path, monkeypatch):
+    import ee
+
+    monkeypatch.setattr(
+        ee.data,
+        "computeFeatures",
+        lambda params: pd.DataFrame([{"OBJECTID": 7, "new_water_ha": 3.5}]),
+    )
+    path = str(tmp_path / "summary.csv")
+
+    df = compare.write_summary(summary(), path)
+
+    assert df.to_dict("records") == [
+        {"OBJECTID": "7", "new_water_ha": 3.5, "disappeared_water_ha": 0.0}
+    ]
+    assert pd.read_csv(path).columns.tolist() == compare.SUMMARY_COLUMNS
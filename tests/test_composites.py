@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from easement_app import composites
+
+GEOMETRY = {
+    "type": "Polygon",
+    "coordinates": [[[-101, 40], [-100, 40], [-100, 41], [-101, 41], [-101, 40]]],
+}
+
+
+class Downloader:
+    """Stands in for download_image(): writes a placeholder file per year."""
+
+    def __init__(self, fail_year=None):
+        self.fail_year = fail_year
+        self.years = []
+
+    def __call__(self, image, region, path, scale):
+        year = int(os.path.basename(path)[: -len(".tif")])
+        if year == self.fail_year:
+            raise RuntimeError("interrupted")
+        self.years.append(year)
+        with open(path, "wb") as f:
+            f.write(b"tif")
+
+
+def test_precompute_resumes_after_interrupt(tmp_path, recorder):
+    store = str(tmp_path)
+    download = Downloader(fail_year=2002)
+    with pytest.raises(RuntimeError):
+        composites.precompute_easement(
+            1, GEOMETRY, 2000, 2004, store=store, download=download
+        )
+    assert download.years == [2000, 2001]
+
+    download = Downloader()
+    count = composites.precompute_easement(
+        1, GEOMETRY, 2000, 2004, store=store, download=download
+    )
+
+    assert count == 3
+    assert download.years == [2002, 2003, 2004]
+    frames = composites.cached_frames(1, 2000, 2004, store=store)
+    assert [year for year, _ in frames] == list(range(2000, 2005))
+
+    # Nothing left to do: no Earth Engine request either.
+    recorder.reset()
+    assert composites.precompute_easement(1, GEOMETRY, 2000, 2004, store=store) == 0
+    assert recorder.count() == 0
+
+
+def test_empty_years_are_marked_and_skipped(tmp_path, monkeypatch):
+    store = str(tmp_path)
+    annual_composite = composites.annual_composite
+    requested = []
+
+    def without_2001(roi, year, window=composites.DEFAULT_WINDOW):
+        requested.append(year)
+        if year == 2001:
+            return None
+        return annual_composite(roi, year, window)
+
+    monkeypatch.setattr(composites, "annual_composite", without_2001)
+    download = Downloader()
+    count = composites.precompute_easement(
+        1, GEOMETRY, 2000, 2002, store=store, download=download
+    )
+
+    assert count == 2
+    assert download.years == [2000, 2002]
+    empty_path = composites.composite_path(1, 2001, store=store)[: -len(".tif")]
+    assert os.path.exists(empty_path + ".empty")
+    frames = composites.cached_frames(1, 2000, 2002, store=store)
+    assert [year for year, _ in frames] == [2000, 2002]
+
+    requested.clear()
+    composites.precompute_easement(1, GEOMETRY, 2000, 2002, store=store)
+    assert requested == []
+
+
+def test_cached_frames_needs_every_year_of_the_window(tmp_path):
+    store = str(tmp_path)
+    composites.precompute_easement(
+        1, GEOMETRY, 2000, 2001, store=store, download=Downloader()
+    )
+
+    assert composites.cached_frames(1, 2000, 2001, store=store) is not None
+    assert composites.cached_frames(1, 2000, 2002, store=store) is None
+    assert composites.cached_frames(2, 2000, 2001, store=store) is None
+    other = ("06-01", "09-01")
+    assert composites.cached_frames(1, 2000, 2001, window=other, store=store) is None
+
+
+def test_precompute_reports_failures_per_easement(tmp_path, index):
+    store = str(tmp_path)
+
+    results = list(
+        composites.precompute(
+            index, 2000, 2001, store=store, download=Downloader(fail_year=2001)
+        )
+    )
+
+    [(objectid, error)] = results
+    assert objectid == 1
+    assert isinstance(error, RuntimeError)
+    results = list(
+        composites.precompute(index, 2000, 2001, store=store, download=Downloader())
+    )
+    assert results == [(1, 1)]
+    assert list(composites.precompute(index, 2000, 2001, objectids=[2])) == []
@@ -0,0 +1,73 @@
+import os
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from easement_app import easements
+from easement_app.easements import EasementIndex
+
+
+def make_gdf(records):
+    """A GeoDataFrame of (OBJECTID, NEST_AGREE, (minx, miny, maxx, maxy)) rows."""
+    return gpd.GeoDataFrame(
+        {
+            "OBJECTID": [objectid for objectid, _, _ in records],
+            "NEST_AGREE": [agreement for _, agreement, _ in records],
+        },
+        geometry=[box(*bounds) for _, _, bounds in records],
+        crs="EPSG:4326",
+    )
+
+
+@pytest.fixture
+def gdf():
+    return make_gdf(
+        [
+            (12, "AG-100", (0, 0, 2, 2)),
+            (1, "AG-12", (1, 1, 3, 3)),
+            (120, "AG-1", (10, 10, 11, 11)),
+            (7, "12", (20, 20, 21, 21)),
+        ]
+    )
+
+
+def test_locate_returns_the_lowest_overlapping_easement(gdf):
+    index = EasementIndex(gdf)
+
+    assert index.locate(1.5, 1.5) == 0
+    assert index.locate(2.5, 2.5) == 1
+    assert index.locate(0.5, 0.5) == 0
+    assert index.locate(5, 5) is None
+    assert index.feature(1)["properties"]["NEST_AGREE"] == "AG-12"
+
+
+def test_search_returns_exact_matches_before_prefixes(gdf):
+    index = EasementIndex(gdf)
+
+    # OBJECTID 12 and NEST_AGREE "12" match exactly; OBJECTID 120 by prefix.
+    assert index.search("12") == [0, 3, 2]
+    assert index.search(" ag-1 ") == [2, 0, 1]
+    assert index.search("AG-1", limit=2) == [2, 0]
+    assert index.search("AG-2") == []
+    assert index.search("") == []
+
+
+def test_get_index_reloads_when_the_snapshot_changes(gdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(easements, "_index", None)
+    monkeypatch.setattr(easements, "_index_mtime", None)
+    path = str(tmp_path / "easements.parquet")
+
+    assert easements.get_index(path) is None
+
+    gdf.to_parquet(path)
+    first = easements.get_index(path)
+    assert len(first) == 4
+    assert easements.get_index(path) is first
+
+    gdf.iloc[:2].to_parquet(path)
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+    second = easements.get_index(path)
+    assert second is not first
+    assert len(second) == 2
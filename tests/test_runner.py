@@ -0,0 +1,75 @@
+import json
+from datetime import date
+
+from easement_app import runner
+
+
+def make_jobs(count):
+    return [
+        {
+            "OBJECTID": "1",
+            "pre_start": date(2014, 1, 1),
+            "pre_end": date(2014, 12, 31),
+            "post_start": date(2020 + i, 1, 1),
+            "post_end": date(2020 + i, 12, 31),
+            **runner.DEFAULTS,
+        }
+        for i in range(count)
+    ]
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_run_writes_one_record_per_job(tmp_path, index, recorder):
+    path = str(tmp_path / "results.jsonl")
+    jobs = make_jobs(3)
+
+    results = dict(runner.run(jobs, index, path, workers=2))
+
+    assert set(results) == {runner.job_key(job) for job in jobs}
+    for result in results.values():
+        assert result == {"new_water_ha": 1.0, "disappeared_water_ha": 2.0}
+    # One reduceRegion().getInfo() per job.
+    assert recorder.count() == 3
+    assert {record["key"] for record in read_results(path)} == set(results)
+
+
+def test_run_resumes_after_interrupt(tmp_path, index, recorder):
+    path = str(tmp_path / "results.jsonl")
+    jobs = make_jobs(3)
+    first = runner.job_key(jobs[0])
+
+    def interrupted(job, geometry, scale):
+        if runner.job_key(job) != first:
+            raise RuntimeError("interrupted")
+        return runner.analyze(job, geometry, scale)
+
+    results = dict(runner.run(jobs, index, path, workers=1, analyze=interrupted))
+    assert isinstance(results[runner.job_key(jobs[1])], RuntimeError)
+    # A record cut short by the crash is ignored and its item redone.
+    with open(path, "a") as f:
+        f.write('{"key": "')
+
+    recorder.reset()
+    results = dict(runner.run(jobs, index, path, workers=2))
+
+    assert set(results) == {runner.job_key(job) for job in jobs[1:]}
+    assert recorder.count() == 2
+    assert runner.completed_keys(path) == {runner.job_key(job) for job in jobs}
+
+
+def test_quota_errors_are_retried():
+    calls = []
+    sleeps = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) < 3:
+            raise Exception("Too many concurrent aggregations.")
+        return "done"
+
+    assert runner.with_backoff(fn, retries=3, backoff=1, sleep=sleeps.append) == "done"
+    assert len(sleeps) == 2
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from easement_app import scheduler
+from easement_app.scheduler import BACKGROUND, CHART, INTERACTIVE, Scheduler
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_interactive_requests_jump_the_queue():
+    s = Scheduler(rate=1000, burst=1000, max_concurrent=1, reserved=0)
+    order = []
+
+    def request(level):
+        with s.slot(level):
+            order.append(level)
+
+    s.acquire(INTERACTIVE)
+    threads = []
+    for count, level in enumerate([BACKGROUND, CHART, INTERACTIVE], 1):
+        threads.append(start(request, level))
+        wait_until(lambda: s.stats()["waiting"] == count)
+    s.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [INTERACTIVE, CHART, BACKGROUND]
+
+
+def test_reserved_slots_are_kept_for_interactive_requests():
+    s = Scheduler(rate=1000, burst=1000, max_concurrent=3, reserved=1)
+    admitted = []
+
+    def request(name, level):
+        s.acquire(level)
+        admitted.append(name)
+
+    s.acquire(CHART)
+    s.acquire(CHART)
+    start(request, "chart", CHART)
+    wait_until(lambda: s.stats()["waiting"] == 1)
+    start(request, "interactive", INTERACTIVE)
+    wait_until(lambda: admitted == ["interactive"])
+    time.sleep(0.05)
+    # The third chart request would take the reserved slot.
+    assert admitted == ["interactive"]
+
+    s.release()
+    s.release()
+    wait_until(lambda: admitted == ["interactive", "chart"])
+
+
+def test_background_requests_use_at_most_half_of_the_slots():
+    s = Scheduler(rate=1000, burst=1000, max_concurrent=4, reserved=1)
+    admitted = []
+
+    def request():
+        s.acquire(BACKGROUND)
+        admitted.append(None)
+
+    for _ in range(3):
+        start(request)
+    wait_until(lambda: len(admitted) == 2)
+    time.sleep(0.05)
+    assert s.stats() == {"running": 2, "waiting": 1}
+
+    s.release()
+    wait_until(lambda: len(admitted) == 3)
+
+
+def test_token_bucket_throttles_requests():
+    s = Scheduler(rate=20, burst=2, max_concurrent=10, reserved=0)
+
+    start_time = time.monotonic()
+    for _ in range(6):
+        with s.slot(INTERACTIVE):
+            pass
+    elapsed = time.monotonic() - start_time
+
+    # Two requests from the burst, then one every 1/20 s.
+    assert 0.18 <= elapsed < 1
+
+
+def test_install_routes_ee_data_through_the_scheduler(monkeypatch):
+    import ee
+
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fakeRequest(value):
+        with lock:
+            running.append(None)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+        return value * 2
+
+    monkeypatch.setattr(scheduler, "EE_FUNCTIONS", ["fakeRequest"])
+    monkeypatch.setattr(
+        scheduler, "_scheduler", Scheduler(rate=1000, burst=1000, max_concurrent=1)
+    )
+    monkeypatch.setattr(ee.data, "fakeRequest", fakeRequest, raising=False)
+    scheduler.install()
+    wrapped = ee.data.fakeRequest
+    scheduler.install()
+
+    assert ee.data.fakeRequest is wrapped
+    assert wrapped.__scheduled__
+    results = []
+    threads = [start(lambda i=i: results.append(wrapped(i))) for i in range(5)]
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(results) == [0, 2, 4, 6, 8]
+    assert max(peak) == 1
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from easement_app import tileproxy, tiles
+from easement_app.diskcache import DiskLRU
+from easement_app.memo import BoundedLRU
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.fixture
+def upstream():
+    """A local stand-in tile server that counts its requests."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            # Slow enough for concurrent requests to overlap.
+            time.sleep(0.2)
+            if self.path.startswith("/missing/"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(PNG)))
+            self.end_headers()
+            self.wfile.write(PNG)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def proxy(tmp_path, monkeypatch):
+    monkeypatch.setattr(tileproxy, "ENABLED", True)
+    monkeypatch.setattr(tileproxy, "_store", DiskLRU(str(tmp_path), 1024**2))
+    monkeypatch.setattr(tileproxy, "_upstreams", BoundedLRU(1024**2))
+
+
+def test_concurrent_requests_share_one_upstream_fetch(proxy, upstream):
+    base, hits = upstream
+    url = tileproxy.layer_url("layer", base + "/{z}/{x}/{y}.png")
+    assert url == "/tiles/layer/{z}/{x}/{y}"
+    assert tileproxy.layer_key(url) == "layer"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tiles_ = list(
+            pool.map(lambda _: tileproxy.get_tile("layer", 3, 2, 1), range(8))
+        )
+
+    assert tiles_ == [PNG] * 8
+    assert hits == ["/3/2/1.png"]
+    # Served from disk from now on.
+    assert tileproxy.get_tile("layer", 3, 2, 1) == PNG
+    assert len(hits) == 1
+    assert tileproxy.media_type(PNG) == "image/png"
+
+
+def test_missing_tiles_and_layers(proxy, upstream):
+    base, hits = upstream
+    tileproxy.layer_url("missing", base + "/missing/{z}/{x}/{y}.png")
+
+    assert tileproxy.get_tile("missing", 1, 0, 0) is None
+    assert tileproxy.get_tile("unknown", 1, 0, 0) is None
+    assert len(hits) == 1
+
+
+def test_upstream_registry_is_bounded(proxy, monkeypatch):
+    monkeypatch.setattr(tileproxy, "_upstreams", BoundedLRU(1000))
+    for i in range(100):
+        tileproxy.layer_url(
+            f"layer{i}", f"https://tiles.test/{i:04d}/{{z}}/{{x}}/{{y}}"
+        )
+
+    assert tileproxy._upstreams.nbytes <= 1000
+    assert tileproxy._upstreams.get("layer0") is None
+    assert tileproxy._upstreams.get("layer99").startswith("https://tiles.test/0099/")
+    assert tileproxy.get_tile("layer0", 1, 0, 0) is None
+
+
+def test_ee_tile_urls_point_at_the_proxy(proxy, recorder):
+    import ee
+
+    tiles.clear()
+    image = ee.Image("JRC/GSW1_4/GlobalSurfaceWater").select(["occurrence"])
+    url = tiles.get_tile_url(image, {"min": 0, "max": 100})
+
+    layer_key = tileproxy.layer_key(url)
+    assert layer_key is not None
+    assert tileproxy._upstreams.get(layer_key).startswith("https://fake-ee.test/")
+    # A refreshed map ID keeps the layer key, so cached tiles stay valid.
+    assert tiles.get_tile_url(image, {"min": 0, "max": 100}, refresh=True) == url
+    assert recorder.count() == 2
+
+
+def test_compare_page_layers_use_the_proxy(proxy, index_file, recorder):
+    import round_trips
+
+    m = round_trips.build_map("compare")
+    round_trips.click_map(m)
+    round_trips.wait(m)
+    round_trips.click_button(m, "Apply")
+    round_trips.wait(m)
+
+    names = {layer.name for layer in m.layers}
+    assert {"Pre-event Image", "Post-event Image"} <= names
+    for layer in m.layers[1:]:
+        url = getattr(layer, "url", None)
+        if url is not None:
+            assert tileproxy.layer_key(url) is not None, layer.name